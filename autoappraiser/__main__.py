@@ -1,5 +1,22 @@
-from autoappraiser.auto_appraiser import AutoAppraiser
+import argparse
+import multiprocessing
 
 if __name__ == "__main__":
-    app = AutoAppraiser()
+    # OCR worker processes re-run this module; only the parent builds the app
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="Auto Appraiser")
+    parser.add_argument("--startup-report", nargs="?", const="startup_report.txt", metavar="PATH",
+                        help="write phase and import timings of this start (.json for JSON)")
+    args, _ = parser.parse_known_args()
+
+    startup = None
+    if args.startup_report:
+        # Installed before the app's imports so they are all timed
+        from autoappraiser.startup import StartupReport
+        startup = StartupReport(args.startup_report)
+
+    from autoappraiser.auto_appraiser import AutoAppraiser
+    if startup is not None:
+        startup.mark("imports")
+    app = AutoAppraiser(startup)
     app.run()
@@ -12,28 +12,70 @@ and application logic. Most functionality is inherited from utility modules:
 - Misc: Miscellaneous helper functions
 """
 
-import asyncio
+import copy
 import customtkinter as ctk
-import dxcam_cpp as dxcam
-import mss
 import os
 import re
 import threading
 import time
-import winrt.windows.graphics.imaging as imaging
-import winrt.windows.storage.streams as streams
-import winrt.windows.foundation
 
-from PIL import Image
-import pydirectinput
+import numpy as np
 
 from autoappraiser.core.capture_box import CaptureBox
 from autoappraiser.utils import Utils
-from rapidfuzz import process
+from autoappraiser.utils.button_matcher import ButtonTemplate
+from autoappraiser.utils.cancel import CancelToken, Cancelled
+from autoappraiser.utils.frame import BufferPool, Frame, release
+from autoappraiser.utils.lanes import Lane, LaneBox, LaneScheduler
+from autoappraiser.utils.loop_timer import LoopTimer
+from autoappraiser.utils.mask_gate import MaskGate
+from autoappraiser.utils.metrics import Metrics
+from autoappraiser.utils.ocr_cache import OcrCache
+from autoappraiser.utils.ocr_service import OcrService
+from autoappraiser.utils.pipeline import Pipeline
+from autoappraiser.utils.process_ocr import ProcessOcr
+from autoappraiser.utils.scheduler import ActionScheduler
+from autoappraiser.utils.session_log import SessionLog, make_record
+from autoappraiser.utils.text_filter import TextFilter, parse_ranges
+from autoappraiser.utils.text_roi import TextRoi
+from autoappraiser.utils.text_templates import TextTemplateIndex
+from autoappraiser.utils.text_trigger import TextTrigger
+from autoappraiser.utils.totem_planner import TotemPlanner
+
+# One template hit in this many is also read by the OCR engine as a check
+TEMPLATE_VERIFY_EVERY = 25
+# Seconds the startup warm-up gives the first OCR call (engine and model load)
+WARM_UP_TIMEOUT = 5
+# Grabs tried (this many ms apart) before saving a button template gives up
+TEMPLATE_GRAB_ATTEMPTS = 10
+TEMPLATE_GRAB_RETRY_MS = 50
+# How often a stop that overran stop_timeout_ms is checked again
+STOP_RECHECK_MS = 100
+
+
+class HeadlessRoot:
+    """Stands in for the Tk root of a headless app: scheduled GUI callbacks are dropped."""
+
+    def after(self, ms, fn=None):
+        pass
+
+    def winfo_screenwidth(self):
+        return 1920
+
+    def winfo_screenheight(self):
+        return 1080
+
+
+class HeadlessLabel:
+    def configure(self, **kwargs):
+        pass
+
 
 class AutoAppraiser(Utils):
-    def __init__(self):
+    def __init__(self, startup=None):
         super().__init__()
+        # Optional StartupReport (--startup-report) that phases are marked on
+        self.startup = startup
         ctk.set_appearance_mode("Dark")
         ctk.set_default_color_theme("blue")
 
@@ -79,12 +121,52 @@ class AutoAppraiser(Utils):
         self.root.bind("<<ExitApp>>", lambda e: self._exit_app())
         self.root.bind("<<TestCapture>>", lambda e: self._test_capture())
 
-        config = self.load_config()
+        self._setup(self.load_config())
+        self.create_widgets()
+        self._startup_mark("init")
+
+    @classmethod
+    def headless(cls, config=None):
+        """
+        The app without a window, for tools that drive ``appraise_worker``.
+
+        Built from ``config`` (a copy of the defaults if None) by the same
+        setup as the GUI, with plain ``LaneBox``es for the overlays and GUI
+        updates dropped. Camera and OCR engine are left unset, as they are
+        before ``_warm_up``.
+        """
+        app = cls.__new__(cls)
+        Utils.__init__(app)
+        app.startup = None
+        app.root = HeadlessRoot()
+        app.status_label = HeadlessLabel()
+        app.capture_box = LaneBox(0, 0, 0, 0)
+        app.gp_box = LaneBox(0, 0, 0, 0)
+        app.gp_confirm_box = LaneBox(0, 0, 0, 0)
+        app._setup(config if config is not None else copy.deepcopy(cls.DEFAULT_CONFIG))
+        # No mutation checkboxes, so nothing is selected to keep
+        app.checkbox_vars = {}
+        app.build_matcher()
+        return app
+
+    def _setup(self, config):
+        # Everything but the window and its widgets
         self.capture_mode = config['ocr']['capture_mode']
         self.capture_box.capture_width = config['ocr']['capture_width']
         self.capture_box.capture_height = config['ocr']['capture_height']
         self.capture_box.capture_x = config['ocr']['capture_x']
         self.capture_box.capture_y = config['ocr']['capture_y']
+        self.ocr_timeout = config['ocr']['timeout_ms']
+        self.ocr_cache = OcrCache(config['ocr']['cache_size'], config['ocr']['cache_file'] or None)
+        self.ocr_cache.load()
+        self.text_filter = TextFilter(parse_ranges(config['ocr']['color_ranges']))
+        self.mask_gate = MaskGate()
+        self.use_roi = config['ocr']['roi']
+        self.ocr_workers = config['ocr']['workers']
+        self.text_roi = TextRoi(config['ocr']['text_height'])
+        self.text_templates = TextTemplateIndex(config['ocr']['template_file'] or None, min_score=config['ocr']['template_min_score'])
+        self.text_templates.load()
+        self.template_hits = 0
         self.use_gp = config['gp']['enabled']
         self.gp_box.capture_width = config['gp']['capture_width']
         self.gp_box.capture_height = config['gp']['capture_height']
@@ -94,13 +176,28 @@ class AutoAppraiser(Utils):
         self.gp_confirm_box.capture_height = config['gp']['confirm_height']
         self.gp_confirm_box.capture_x = config['gp']['confirm_x']
         self.gp_confirm_box.capture_y = config['gp']['confirm_y']
+        self.gp_menu_key = config['gp']['menu_key']
+        self.gp_template = ButtonTemplate(config['gp']['button_template'], config['gp']['match_threshold'])
+        self.gp_confirm_template = ButtonTemplate(config['gp']['confirm_template'], config['gp']['match_threshold'])
+        self.gp_timeout = config['gp']['detect_timeout_ms']
         self.loop_interval = config['appraise']['loop_interval']
         self.auto_totem = config['appraise']['auto_totem']
         self.fish_slot = config['appraise']['fish_slot']
         self.totem_slot = config['appraise']['totem_slot']
         self.totem_interval = config['appraise']['totem_interval']
-        self.last_totem = None
+        self.text_trigger = config['appraise']['text_trigger']
+        self.text_max_wait = config['appraise']['text_max_wait_ms']
+        self.adaptive_timing = config['appraise']['adaptive_timing']
+        self.loop_timer = LoopTimer(self.loop_interval / 1000, enabled=self.adaptive_timing)
+        self.scheduler = ActionScheduler()
+        self.stop_timeout = config['appraise']['stop_timeout_ms']
+        self.totem_planner = TotemPlanner(self.totem_interval * 60)
         self.lists = config['mutations']['lists']
+        self.metrics = Metrics()
+        self.metrics_file = config['metrics']['file']
+        self.metrics_interval = config['metrics']['interval_s']
+        self.metrics.start_exporter(self.metrics_file, self.metrics_interval)
+        self.session_log = SessionLog(config['appraise']['session_log'] or None).start()
 
         # Load Hotkeys safely
         hotkeys_conf = config.get('hotkeys', {})
@@ -109,17 +206,117 @@ class AutoAppraiser(Utils):
         self.hk_action = hotkeys_conf.get('toggle_action', 'F4')
         self.hk_exit = hotkeys_conf.get('exit_app', 'F5')
 
-        if self.capture_mode == "DXCAM":
-            self.camera = dxcam.create()
-        elif self.capture_mode == "MSS":
-            self.camera = mss.mss()
-        # Initialize OCR engine
-        self.ocr_engine = self.init_ocr_engine()
+        self.use_stream = config['ocr']['stream']
+        self.stream_fps = config['ocr']['stream_fps']
+        self.replay_dir = config['ocr']['replay_dir']
+        self.frame_pool = BufferPool()
+        self.update_screen_size()
+        # Camera, OCR engine and OCR workers are created by _warm_up once the window is up
+        self.camera = None
+        self.camera_lock = threading.Lock()
+        self.capture_backend = None
+        self.ocr_engine = None
+        self.ready = threading.Event()
+        self.ocr_service = OcrService().start()
+        self.pipeline = Pipeline([
+            ("capture", self._stage_capture),
+            ("filter", self._stage_filter),
+            ("ocr", self._stage_ocr),
+            ("decide", self._stage_decide),
+        ])
+        self.trigger = TextTrigger(self.capture_screen, self.frame_pixels, text_filter=self.text_filter)
+        # The main lane is the capture box and the cursor; [[lanes]] adds more clients
+        self.lanes = [Lane("main", self.capture_box, self.trigger, self.loop_timer, self.text_roi, self.totem_planner)]
+        for lane_cfg in config['lanes']:
+            lane = self._make_lane(lane_cfg)
+            if lane is not None:
+                self.lanes.append(lane)
+        self.lane_scheduler = LaneScheduler(self.lanes)
+        self.process_ocr = None
+        if self.ocr_workers > 0:
+            # Slots hold a BGRA frame of the largest box, with room for it to grow
+            largest = max(int(lane.box.capture_width) * int(lane.box.capture_height) for lane in self.lanes)
+            self.process_ocr = ProcessOcr(
+                self.ocr_workers, slot_bytes=largest * 4 * 2, ranges=self.text_filter.ranges,
+                text_height=self.text_roi.text_height, use_roi=self.use_roi,
+            )
 
         self.active = threading.Event()
-        self.mouse_position = None
+        self.cancel_token = CancelToken()
+        self.worker_idle = threading.Event()
 
-        self.create_widgets()
+    def _startup_mark(self, phase):
+        if self.startup is not None:
+            self.startup.mark(phase)
+
+    def _warm_up(self):
+        # Runs while the window is already up: everything slow to create, and
+        # a first call of each so the first appraisal doesn't pay for it
+        try:
+            for phase, step in (
+                ("lut", lambda: self.text_filter.lut),
+                ("camera", self._warm_up_camera),
+                ("input", self.scheduler.backend.load),
+                ("ocr", self._warm_up_ocr),
+                ("ocr_workers", self._warm_up_workers),
+            ):
+                try:
+                    step()
+                except Exception as e:
+                    print(f"Warm-up of {phase} failed: {e}")
+                self._startup_mark(phase)
+        finally:
+            self.ready.set()
+            self.root.after(0, self._on_ready)
+
+    def _warm_up_camera(self):
+        self.switch_camera()
+        self.capture_screen()
+
+    def _warm_up_ocr(self):
+        self.ocr_engine = self.init_ocr_engine()
+        if self.ocr_engine is not None:
+            blank = np.zeros((self.text_roi.text_height, self.text_roi.text_height * 3), np.uint8)
+            self.ocr_service.run(self.recognize_array(self.ocr_engine, blank), timeout=WARM_UP_TIMEOUT)
+
+    def _warm_up_workers(self):
+        if self.process_ocr is None:
+            return
+        try:
+            self.process_ocr.start()
+            blank = np.zeros((self.text_roi.text_height, self.text_roi.text_height * 3, 4), np.uint8)
+            crop, _ = self.process_ocr.prepare(blank, True).result(WARM_UP_TIMEOUT)
+            self.process_ocr.recognize(crop).result(WARM_UP_TIMEOUT)
+        except Exception:
+            # Fall back to filtering and OCR on this process's threads
+            self.process_ocr.stop()
+            self.process_ocr = None
+            raise
+
+    def _on_ready(self):
+        if not self.active.is_set():
+            self.status_label.configure(text="Status: Inactive", text_color="#ff5555")
+        if self.startup is not None:
+            self.startup.mark("ready")
+            self.startup.write()
+            print(f"Startup report written to {self.startup.path}")
+
+    def _make_lane(self, cfg):
+        try:
+            box = LaneBox(cfg['capture_x'], cfg['capture_y'], cfg['capture_width'], cfg['capture_height'])
+            anchor = (int(cfg['anchor_x']), int(cfg['anchor_y']))
+            name = cfg.get('name', f"lane {len(self.lanes)}")
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Ignoring lane {cfg}: {e!r}")
+            return None
+        trigger = TextTrigger(lambda: self.capture_screen(box=box), self.frame_pixels, text_filter=self.text_filter)
+        return Lane(
+            name, box, trigger,
+            LoopTimer(self.loop_interval / 1000, enabled=self.adaptive_timing),
+            TextRoi(self.text_roi.text_height),
+            TotemPlanner(self.totem_interval * 60),
+            anchor=anchor, keep=cfg.get('keep'),
+        )
 
     def _set_icon(self):
         try:
@@ -134,41 +331,76 @@ class AutoAppraiser(Utils):
     def _toggle_box(self):
         if self.capture_box.state() == "withdrawn":
             self.capture_box.deiconify()
-            #self.gp_box.deiconify()
-            #self.gp_confirm_box.deiconify()
+            if self.use_gp:
+                self.gp_box.deiconify()
+                self.gp_confirm_box.deiconify()
         else:
             self.save_config()
             self.capture_box.withdraw()
-            #self.gp_box.withdraw()
-            #self.gp_confirm_box.withdraw()
+            self.update_screen_size()
+            self.gp_box.withdraw()
+            self.gp_confirm_box.withdraw()
 
     def _toggle_action(self):
         if self.active.is_set():
             self.active.clear()
+            self.cancel_token.cancel()
+            for lane in self.lanes:
+                lane.totem_planner.pause()
             self.status_label.configure(text="Status: Inactive", text_color="#ff5555")
-            self.mouse_position = None
+            self.root.after(self.stop_timeout, self._check_stopped)
         else:
+            self.cancel_token = CancelToken()
+            self.lane_scheduler.reset()
             self.active.set()
             self.status_label.configure(text="Status: Active", text_color="#2cc985")
 
+    def _check_stopped(self, overrun=False):
+        # Every wait in the worker is cancellable, so it should be parked by now
+        if self.active.is_set():
+            return
+        if self.worker_idle.is_set():
+            if overrun:
+                self.status_label.configure(text="Status: Inactive", text_color="#ff5555")
+            return
+        if not overrun:
+            self.metrics.error("slow_stop")
+            self.status_label.configure(text="Status: Stopping (slow)", text_color="#ffaa00")
+        self.root.after(STOP_RECHECK_MS, lambda: self._check_stopped(True))
+
     def _exit_app(self):
         self.save_config()
         if self.active.is_set():
             self.active.clear()
-            time.sleep(0.1)
+            self.cancel_token.cancel()
+            self.worker_idle.wait(0.1)
+        self.pipeline.stop()
+        self.metrics.stop(self.metrics_file)
+        self.session_log.stop()
+        if self.camera is not None:
+            self.camera.close()
+        self.ocr_service.stop()
+        if self.process_ocr is not None:
+            self.process_ocr.stop()
+        self.ocr_cache.save()
+        self.text_templates.save()
         self.root.destroy()
         # Ensure thread exit
         os._exit(0)
 
     def _test_capture(self):
+        if not self.ready.is_set():
+            print("Still starting up")
+            return
         frame = self.capture_screen()
         if frame is not None:
             try:
-                # Run async OCR in a synchronous context
-                text = asyncio.run(self.read_frame(frame))
-                frame = self.apply_green_filter(frame)
+                text = self.ocr_frame(frame)
+                img, is_bgra = self.frame_pixels(frame)
+                filtered = Frame(self.text_filter.apply(img, is_bgra).copy(), is_bgra)
+                release(frame)
                 #print(f"OCR Result: '{text}'")
-                self.show_capture_dialog(frame, text)
+                self.show_capture_dialog(filtered, text)
             except Exception as e:
                 #print(f"OCR Error: {e}")
                 self.show_capture_dialog(frame=None, text=f"Failed to read frame: {e}")
@@ -189,7 +421,7 @@ class AutoAppraiser(Utils):
         self.title = ctk.CTkLabel(self.title_frame, text="Auto Appraiser", font=ctk.CTkFont(size=24, weight="bold"))
         self.title.pack(side="left")
 
-        self.status_label = ctk.CTkLabel(self.title_frame, text="Status: Inactive", text_color="#ff5555", font=ctk.CTkFont(size=14, weight="bold"))
+        self.status_label = ctk.CTkLabel(self.title_frame, text="Status: Starting...", text_color="#ff5555", font=ctk.CTkFont(size=14, weight="bold"))
         self.status_label.pack(side="right", padx=10)
 
         # Tabs
@@ -199,6 +431,7 @@ class AutoAppraiser(Utils):
         self.tab_mutations = self.tab_view.add("Mutations")
         self.tab_settings = self.tab_view.add("Settings")
         self.tab_hotkeys = self.tab_view.add("Hotkeys")
+        self.tab_stats = self.tab_view.add("Stats")
 
         # -- Mutations Tab --
         self.tab_mutations.grid_columnconfigure(0, weight=1)
@@ -228,7 +461,7 @@ class AutoAppraiser(Utils):
         # Capture Mode
         ctk.CTkLabel(self.controls_frame, text="Capture Mode:").grid(row=0, column=0, padx=15, pady=15, sticky="w")
         self.capture_mode_var = ctk.StringVar(value=self.capture_mode)
-        ctk.CTkOptionMenu(self.controls_frame, values=["DXCAM", "MSS"], variable=self.capture_mode_var).grid(row=0, column=1, padx=10, pady=15, sticky="ew")
+        ctk.CTkOptionMenu(self.controls_frame, values=self.capture_modes(), variable=self.capture_mode_var).grid(row=0, column=1, padx=10, pady=15, sticky="ew")
 
         # Loop Interval
         ctk.CTkLabel(self.controls_frame, text="Loop Interval (ms):").grid(row=1, column=0, padx=15, pady=15, sticky="w")
@@ -236,16 +469,36 @@ class AutoAppraiser(Utils):
         self.loop_entry.insert(0, str(self.loop_interval))
         self.loop_entry.grid(row=1, column=1, padx=10, pady=15, sticky="ew")
 
+        # Text Trigger
+        ctk.CTkLabel(self.controls_frame, text="Capture When Text Appears:").grid(row=2, column=0, padx=15, pady=15, sticky="w")
+        self.text_trigger_var = ctk.BooleanVar(value=self.text_trigger)
+        ctk.CTkSwitch(self.controls_frame, variable=self.text_trigger_var, text="").grid(row=2, column=1, padx=10, pady=15, sticky="ew")
+
+        # Continuous Capture
+        ctk.CTkLabel(self.controls_frame, text="Continuous Capture (DXCAM):").grid(row=3, column=0, padx=15, pady=15, sticky="w")
+        self.stream_var = ctk.BooleanVar(value=self.use_stream)
+        ctk.CTkSwitch(self.controls_frame, variable=self.stream_var, text="").grid(row=3, column=1, padx=10, pady=15, sticky="ew")
+
+        # Adaptive Timing
+        ctk.CTkLabel(self.controls_frame, text="Adaptive Loop Timing:").grid(row=4, column=0, padx=15, pady=15, sticky="w")
+        self.adaptive_timing_var = ctk.BooleanVar(value=self.adaptive_timing)
+        ctk.CTkSwitch(self.controls_frame, variable=self.adaptive_timing_var, text="").grid(row=4, column=1, padx=10, pady=15, sticky="ew")
+
         # Gamepass
-        ctk.CTkLabel(self.controls_frame, text="Use Gamepass").grid(row=2, column=0, padx=15, pady=15, sticky="w")
+        ctk.CTkLabel(self.controls_frame, text="Use Gamepass").grid(row=5, column=0, padx=15, pady=15, sticky="w")
         self.use_gp_var = ctk.BooleanVar(value=self.use_gp)
-        #gp_switch = ctk.CTkSwitch(self.controls_frame, variable=self.use_gp_var, text="")
-        #gp_switch.configure(state="disabled")
-        #gp_switch.grid(row=2, column=1, padx=10, pady=15, sticky="ew")
-        ctk.CTkLabel(self.controls_frame, text="Gamepass not supported yet").grid(row=2, column=1, padx=10, pady=15, sticky="ew")
+        ctk.CTkSwitch(self.controls_frame, variable=self.use_gp_var, text="").grid(row=5, column=1, padx=10, pady=15, sticky="ew")
+
+        # Gamepass button templates
+        self.gp_tpl_frame = ctk.CTkFrame(self.controls_frame, fg_color="transparent")
+        self.gp_tpl_frame.grid(row=6, column=0, columnspan=2, padx=10, pady=(0, 5), sticky="ew")
+        ctk.CTkButton(self.gp_tpl_frame, text="Grab GP Button (3 s)", height=24, command=lambda: self._grab_template(self.gp_box, self.gp_template)).pack(side="left", padx=2, expand=True, fill="x")
+        ctk.CTkButton(self.gp_tpl_frame, text="Grab Confirm Button (3 s)", height=24, command=lambda: self._grab_template(self.gp_confirm_box, self.gp_confirm_template)).pack(side="left", padx=2, expand=True, fill="x")
+        self.gp_tpl_label = ctk.CTkLabel(self.controls_frame, text=self._template_status())
+        self.gp_tpl_label.grid(row=7, column=0, columnspan=2, padx=10, sticky="ew")
 
         # Save Button
-        ctk.CTkButton(self.controls_frame, text="Save Settings", command=self.save_settings).grid(row=3, column=0, columnspan=2, pady=20)
+        ctk.CTkButton(self.controls_frame, text="Save Settings", command=self.save_settings).grid(row=8, column=0, columnspan=2, pady=20)
 
         self.controls_frame.grid_columnconfigure(1, weight=1)
 
@@ -270,10 +523,50 @@ class AutoAppraiser(Utils):
 
         ctk.CTkButton(self.hk_frame, text="Save & Reload Hotkeys", command=self.save_hotkeys).grid(row=4, column=0, columnspan=2, pady=20)
 
+        # -- Stats Tab --
+        self.stats_label = ctk.CTkLabel(self.tab_stats, text="", justify="left", anchor="nw", font=ctk.CTkFont(family="Consolas", size=12))
+        self.stats_label.pack(fill="both", expand=True, padx=15, pady=15)
+        self._refresh_stats()
+
         # -- Totem Tab (Dynamic) --
         # Initial check
         self._create_totem_tab()
 
+    def _template_status(self):
+        def state(template):
+            return "saved" if template.ready else "missing"
+        return f"GP button template: {state(self.gp_template)}, confirm template: {state(self.gp_confirm_template)}"
+
+    def _grab_template(self, box, template):
+        # Hide the overlays so their tint isn't part of the snapshot, then give
+        # the user a moment to bring up the button in game
+        self.gp_box.withdraw()
+        self.gp_confirm_box.withdraw()
+        self.gp_tpl_label.configure(text="Grabbing in 3 s...")
+        self.root.after(3000, lambda: self._save_template(box, template))
+
+    def _save_template(self, box, template, attempt=1):
+        frame = self.grab_box(box)
+        if frame is None and attempt < TEMPLATE_GRAB_ATTEMPTS:
+            # A backend with no MSS fallback can come back empty on a static screen; try again shortly
+            self.root.after(TEMPLATE_GRAB_RETRY_MS, lambda: self._save_template(box, template, attempt + 1))
+            return
+        try:
+            if frame is None:
+                raise RuntimeError("capture returned nothing")
+            template.save(*self.frame_pixels(frame))
+            self.gp_tpl_label.configure(text=self._template_status())
+        except Exception as e:
+            self.gp_tpl_label.configure(text=f"Failed to save template: {e}")
+
+    def _refresh_stats(self):
+        # Only format the readout while the tab is on screen
+        if self.tab_view.get() == "Stats":
+            self.stats_label.configure(text=self.metrics.format())
+        elif self.tab_view.get() == "Auto Totem":
+            self.next_totem_label.configure(text=self._next_totem_text())
+        self.root.after(1000, self._refresh_stats)
+
     def _create_totem_tab(self):
         try:
             self.totem_tab = self.tab_view.add("Auto Totem")
@@ -308,70 +601,310 @@ class AutoAppraiser(Utils):
         self.totem_entry.insert(0, str(self.totem_interval))
         self.totem_entry.grid(row=3, column=1, padx=10, pady=15, sticky="ew")
 
+        # Next Totem
+        ctk.CTkLabel(self.totem_frame, text="Next Totem:").grid(row=4, column=0, padx=15, pady=15, sticky="w")
+        self.next_totem_label = ctk.CTkLabel(self.totem_frame, text=self._next_totem_text(), anchor="w")
+        self.next_totem_label.grid(row=4, column=1, padx=10, pady=15, sticky="ew")
+
         # Save Button
-        ctk.CTkButton(self.totem_frame, text="Save Settings", command=self.save_settings).grid(row=4, column=0, columnspan=2, pady=20)
+        ctk.CTkButton(self.totem_frame, text="Save Settings", command=self.save_settings).grid(row=5, column=0, columnspan=2, pady=20)
+
+    def _next_totem_text(self):
+        if not self.auto_totem:
+            return "Off"
+        remaining = self.totem_planner.remaining()
+        if remaining <= 0:
+            return "Now (next cycle)"
+        minutes, seconds = divmod(int(remaining), 60)
+        # Planned into the post-capture gap of the last cycle that ends before expiry
+        return f"in {minutes}:{seconds:02d}"
 
 
     async def read_frame(self, frame):
         return await self.recognize_frame(self.ocr_engine, frame)
 
+    def ocr_frame(self, frame):
+        """Recognize a frame on the shared OCR loop, giving up after ``ocr_timeout`` ms."""
+        try:
+            return self.ocr_service.run(self.read_frame(frame), timeout=self.ocr_timeout / 1000)
+        except TimeoutError:
+            print(f"OCR timed out after {self.ocr_timeout} ms")
+            return ""
+
+    def _stage_capture(self, job):
+        if job['token'].cancelled:
+            return None
+        if job.get('frame') is None:
+            with self.metrics.span("capture", job['ms']):
+                job['frame'] = self.capture_screen(after=job.get('after'), box=job['lane'].box)
+        return job if job['frame'] is not None else None
+
+    def _stage_filter(self, job):
+        try:
+            return self._filter(job)
+        finally:
+            # Everything after this stage works on the mask, so a pooled frame buffer can be reused
+            release(job.pop('frame'))
+
+    def _filter(self, job):
+        with self.metrics.span("filter", job['ms']):
+            img, job['is_bgra'] = self.frame_pixels(job['frame'])
+            workers = self._workers_for(img)
+            if workers is not None:
+                # Filtered and cropped in a worker process; only the crop comes back
+                timeout = self.ocr_timeout / 1000
+                try:
+                    future = workers.prepare(img, job['is_bgra'], token=job['token'], timeout=timeout)
+                    job['ocr_img'], job['stats'] = job['token'].result(future, timeout=timeout)
+                except Cancelled:
+                    return None
+                return job
+            if not self.use_roi:
+                job['img'], job['is_bgra'] = self.frame_to_array(job['frame'])
+                job['ocr_img'] = job['img']
+                return job
+            text_roi = job['lane'].text_roi
+            job['img'], box = text_roi.mask(self.text_filter, img, job['is_bgra'])
+            job['ocr_img'] = text_roi.crop(job['img'], box)
+        return job
+
+    def _stage_ocr(self, job):
+        if 'stats' in job:
+            accepted, stats = self.mask_gate.accept_stats(job['stats'])
+        else:
+            accepted, stats = self.mask_gate.accept(job['img'])
+        if not accepted:
+            # Nothing that looks like a text line: don't bother the engine
+            job['text'] = ""
+            job['skipped'] = True
+            self.metrics.count("ocr.skipped")
+            return job
+
+        key = self.ocr_cache.key(job['ocr_img'])
+        job['text'] = self.ocr_cache.get(key)
+        if job['text'] is not None:
+            self.metrics.count("ocr.cache_hits")
+            return job
+
+        with self.metrics.span("template", job['ms']):
+            known = self.text_templates.classify(job['ocr_img'])
+        verify = False
+        if known is not None:
+            self.template_hits += 1
+            # Every so often let the engine read a hit anyway, to catch a stale template
+            verify = self.template_hits % TEMPLATE_VERIFY_EVERY == 0
+            if not verify:
+                job['text'] = known[0]
+                self.metrics.count("ocr.template_hits")
+                return job
+
+        try:
+            with self.metrics.span("ocr", job['ms']):
+                job['text'] = self._read_text(job)
+        except Cancelled:
+            return None
+        except TimeoutError:
+            print(f"OCR timed out after {self.ocr_timeout} ms")
+            self.metrics.error("ocr_timeout")
+            job['text'] = ""
+        # Empty results may come from engine errors, so only real text is cached
+        if job['text']:
+            self.ocr_cache.put(key, job['text'])
+        if verify and job['text'] and job['text'] != known[0]:
+            print(f"Template read {known[0]!r} but OCR read {job['text']!r}, dropping it")
+            self.metrics.error("template_mismatch")
+            self.text_templates.forget(known[0])
+        elif self._clean_read(job['text']):
+            self.text_templates.learn(job['ocr_img'], job['text'])
+        self.mask_gate.learn(stats, job['text'])
+        return job
+
+    def _workers_for(self, img):
+        """The OCR worker pool if it is running and ``img`` fits its slots, else None."""
+        workers = self.process_ocr
+        if workers is None:
+            return None
+        if not workers.alive():
+            print("OCR workers stopped; filtering and reading in the app from now on")
+            self.metrics.error("ocr_workers_dead")
+            self.process_ocr = None
+            workers.stop()
+            return None
+        return workers if workers.fits(img) else None
+
+    def _read_text(self, job):
+        img = job['ocr_img']
+        workers = self._workers_for(img)
+        if workers is not None:
+            timeout = self.ocr_timeout / 1000
+            future = workers.recognize(img, token=job['token'], timeout=timeout)
+            return job['token'].result(future, timeout=timeout)
+        coro = self.recognize_array(self.ocr_engine, img, job['is_bgra'])
+        return self.ocr_service.run(coro, timeout=self.ocr_timeout / 1000, token=job['token'])
+
+    def _clean_read(self, text):
+        # Only text where every mutation matched exactly is trusted as a template label
+        scored = self.matcher.match_scored(text)
+        return bool(scored) and all(score == 100 for _, score in scored)
+
+    def _stage_decide(self, job):
+        lane = job['lane']
+        matcher = lane.matcher or self.matcher
+        with self.metrics.span("match", job['ms']):
+            scored = matcher.match_scored(job['text'])
+            job['matches'] = [choice for choice, _ in scored]
+            job['match'], job['score'] = scored[0] if scored else (None, None)
+            kept = matcher.kept(job['matches'])
+
+        if kept:
+            self.metrics.count("found")
+            found = ", ".join(kept)
+            if len(self.lanes) > 1:
+                found += f" ({lane.name})"
+            # Only this client stops; the others keep appraising
+            if self.lane_scheduler.stop(lane):
+                self._stop_appraising()
+            self.root.after(0, lambda d=found: self.show_found_dialog(d))
+            job['found'] = True
+        # The one outcome of this cycle: a stall, or a capture with no readable
+        # text, means the loop ran ahead of the game
+        lane.loop_timer.result(bool(job['text']) and not job.get('stalled'))
+        self.session_log.append(make_record(job))
+        return job
+
+    def _stop_appraising(self):
+        self.active.clear()
+        # Also cuts short clicks already queued for the next appraisal
+        self.cancel_token.cancel()
+        for lane in self.lanes:
+            lane.totem_planner.pause()
+
+        # Safely update GUI on main thread
+        self.root.after(0, lambda: self.status_label.configure(text="Status: Inactive", text_color="#ff5555"))
+
+    def _await_decision(self, pending, token):
+        """Block until the previous appraisal is decided; stop if it never is."""
+        try:
+            job = token.result(pending, timeout=self.ocr_timeout / 1000 + 1)
+            return bool(job and job.get('found'))
+        except Cancelled:
+            raise
+        except TimeoutError:
+            print("Appraisal decision timed out, stopping")
+            self.metrics.error("decision_timeout")
+            pending.cancel()
+            self._stop_appraising()
+        except Exception as e:
+            print(f"Error in pipeline: {e}")
+            self.metrics.error(type(e).__name__)
+        return False
+
     def appraise_worker(self):
+        # Capture, filter, OCR and the decision run as pipeline stages so the
+        # decision for appraisal N overlaps the wait before appraisal N+1.
+        # With several lanes the worker serves whichever lane is due first,
+        # so one client is clicked while another one's capture is in OCR.
+        # Every wait goes through the run's cancel token, so stopping takes
+        # effect before the next input call rather than after the cycle.
         while True:
+            self.worker_idle.set()
             self.active.wait()
+            # Started before warm-up finished: wait for the camera and OCR engine
+            self.ready.wait()
+            if not self.active.is_set():
+                continue
+            self.worker_idle.clear()
+            token = self.cancel_token
             try:
-                if self.mouse_position is None:
-                    self.mouse_position = pydirectinput.position()
-
-                if self.auto_totem:
-                    self.do_totem(self.mouse_position)
-
-                if self.use_gp: # TODO: implement gp appraise
-                    #self.appraise_gp()
-                    self.active.clear()
+                lane = self.lane_scheduler.next()
+                if lane is None:
+                    self._stop_appraising()
                     continue
-                else:
-                    self.appraise_normal()
+                token.sleep(lane.next_at - time.monotonic())
 
-                # Give time for the GUI/Text to appear before capturing
-                time.sleep(0.8) 
-                
-                frame = self.capture_screen()
-                if frame is not None:
-                    # Async call
-                    result = asyncio.run(self.read_frame(frame))
-
-                    # Workaround for "Today/Tonight have boosted chance to get Mutated fish" messages
-                    mutations = self.lists.copy()
-                    mutations.append("Mutated")
-
-                    # Process result with rapidfuzz
-                    result = process.extractOne(result, mutations)
-                    result = result[0]
-                    if not result:
+                if lane.pending is not None:
+                    # Never fire a lane's next appraisal before its last one is decided
+                    pending, lane.pending = lane.pending, None
+                    self._await_decision(pending, token)
+                    if not lane.active or not self.active.is_set():
                         continue
 
-                    found_match = False
-                    selected_lists = [desc for desc, var in self.checkbox_vars.items() if var.get()]
-                    if result in selected_lists:
-                        # Stop the loop
-                        self.active.clear()
-                        self.mouse_position = None
-                        
-                        # Safely update GUI on main thread
-                        self.root.after(0, lambda: self.status_label.configure(text="Status: Inactive", text_color="#ff5555"))
-                        self.root.after(0, lambda d=result: self.show_found_dialog(d))
-                        
-                        found_match = True
+                if lane.anchor is None:
+                    lane.anchor = self.scheduler.backend.position()
+
+                lane.totem_planner.cycle()
+                if self.auto_totem and lane.totem_planner.overdue():
+                    # First use, or the loop was stopped past the planned gap
+                    self.do_totem(lane, token)
+
+                job = {'ms': {}, 'token': token, 'lane': lane}
+                interval = lane.loop_timer.interval
+                self.metrics.record("interval", interval)
+
+                # Gamepass buttons are only set up for the main capture box
+                if self.use_gp and lane is self.lanes[0]:
+                    if not (self.gp_template.ready and self.gp_confirm_template.ready):
+                        print("Gamepass mode needs both button templates (Settings tab)")
+                        self._stop_appraising()
                         continue
+                    with self.metrics.span("input", job['ms']):
+                        pressed = self.appraise_gp(lane, token)
+                    if not pressed:
+                        self.lane_scheduler.done(lane, lane.loop_timer.interval)
+                        continue
+                else:
+                    with self.metrics.span("input", job['ms']):
+                        self.appraise_normal(lane, token)
 
-                    if found_match:
+                # Give time for the GUI/Text to appear before capturing
+                frame = None
+                with self.metrics.span("text_wait", job['ms']):
+                    if self.text_trigger:
+                        # appraise_normal armed the trigger before its last clicks
+                        frame = lane.trigger.wait(interval + self.text_max_wait / 1000, token)
+                    else:
+                        token.sleep(self.text_max_wait / 1000)
+
+                if self.text_trigger:
+                    if frame is not None and lane.trigger.changed_at is not None:
+                        lane.loop_timer.observe(lane.trigger.changed_at - lane.last_click)
+                    else:
+                        # Counted as a failure when the decide stage records this cycle's outcome
+                        self.metrics.count("text_stalls")
+                        job['stalled'] = True
+
+                job['frame'] = frame
+                job['after'] = time.monotonic()
+                try:
+                    lane.pending = self.pipeline.submit(job, token)
+                except Cancelled:
+                    # Never reached the filter stage, which would have released it
+                    release(job.pop('frame'))
+                    raise
+                self.metrics.count("appraisals")
+                gap_start = time.monotonic()
+
+                if self.auto_totem and lane.totem_planner.use_in_gap():
+                    # The totem would run out mid next cycle: use it in this gap,
+                    # once the decision is in so a find never waits on it
+                    pending, lane.pending = lane.pending, None
+                    self._await_decision(pending, token)
+                    if not lane.active or not self.active.is_set():
                         continue
+                    self.do_totem(lane, token)
+
+                # Other lanes are served while this one waits out its interval
+                self.lane_scheduler.done(lane, lane.loop_timer.interval - (time.monotonic() - gap_start))
 
+            except Cancelled:
+                for lane in self.lanes:
+                    lane.pending = None
+                    lane.trigger.disarm()
+                self.metrics.count("stops")
             except Exception as e:
                 print(f"Error in worker: {e}")
-                time.sleep(1)
-
-            time.sleep(self.loop_interval / 1000)
+                self.metrics.error(type(e).__name__)
+                token.wait(1)
 
     def show_capture_dialog(self, frame=None, text=None):
         top = ctk.CTkToplevel(self.root)
@@ -385,29 +918,16 @@ class AutoAppraiser(Utils):
             return
 
         # Convert frame to PIL Image
-        if isinstance(frame, imaging.SoftwareBitmap):
-            # Handle SoftwareBitmap (MSS mode)
-            width = frame.pixel_width
-            height = frame.pixel_height
-            
-            # Copy to buffer
-            buf_len = width * height * 4
-            buf = streams.Buffer(buf_len)
-            frame.copy_to_buffer(buf)
-            
-            # Read bytes
-            reader = streams.DataReader.from_buffer(buf)
-            pixel_bytes = bytearray(buf_len)
-            reader.read_bytes(pixel_bytes)
-            
-            # Create PIL Image (BGRA -> RGBA/RGB)
-            # MSS/WinRT is usually BGRA8
-            img = Image.frombytes('RGBA', (width, height), pixel_bytes, 'raw', 'BGRA')
+        from PIL import Image
+        pixels, is_bgra = self.frame_pixels(frame)
+        if is_bgra:
+            # MSS frames are BGRA8
+            img = Image.frombytes('RGBA', (pixels.shape[1], pixels.shape[0]), pixels.tobytes(), 'raw', 'BGRA')
         else:
-            # Handle Numpy array (DXCAM mode)
-            img = Image.fromarray(frame)
+            # DXCAM frames are RGB
+            img = Image.fromarray(pixels)
 
-        lbl_text = ctk.CTkLabel(top, text=f"Capture Mode: {self.capture_mode}", wraplength=350)
+        lbl_text = ctk.CTkLabel(top, text=f"Capture Mode: {self.capture_mode} ({self.capture_backend})", wraplength=350)
         lbl_text.pack(padx=20, pady=(0, 0))
         
         # Create CTkImage - keeping original size
@@ -419,10 +939,16 @@ class AutoAppraiser(Utils):
         lbl_text = ctk.CTkLabel(top, text=f"OCR Result:\n{text}", wraplength=350)
         lbl_text.pack(padx=20, pady=(0, 20))
 
-        fuzz_text = process.extractOne(text, self.lists)
-        fuzz_text = fuzz_text[0]
+        matches = self.matcher.match_all(text)
+        fuzz_text = ", ".join(matches) if matches else "(no match)"
+
+        lbl_text = ctk.CTkLabel(top, text=f"Matched mutations:\n{fuzz_text}", wraplength=350)
+        lbl_text.pack(padx=20, pady=(0, 20))
 
-        lbl_text = ctk.CTkLabel(top, text=f"rapidfuzz result:\n{fuzz_text}", wraplength=350)
+        stats = self.ocr_cache.stats()
+        window = self.text_roi.window(pixels.shape) if self.use_roi else None
+        roi_text = f"{window[2] - window[0]}x{window[3] - window[1]} at ({window[0]}, {window[1]})" if window else "full frame"
+        lbl_text = ctk.CTkLabel(top, text=f"OCR cache: {stats['hits']} hits / {stats['misses']} misses ({stats['entries']} entries)\nOCR skipped (no text): {self.mask_gate.skipped} / {self.mask_gate.skipped + self.mask_gate.passed}\nFiltered region: {roi_text}", wraplength=350)
         lbl_text.pack(padx=20, pady=(0, 20))
 
     def show_found_dialog(self, text):
@@ -447,7 +973,10 @@ class AutoAppraiser(Utils):
         self.gp_confirm_box.geometry(f"{self.gp_confirm_box.capture_width}x{self.gp_confirm_box.capture_height}+{self.gp_confirm_box.capture_x}+{self.gp_confirm_box.capture_y}")
         self.gp_confirm_box.withdraw()
 
+        self.pipeline.start()
         threading.Thread(target=self.appraise_worker, daemon=True).start()
+        threading.Thread(target=self._warm_up, name="warm-up", daemon=True).start()
 
         self.root.protocol("WM_DELETE_WINDOW", self._exit_app)
+        self.root.after(0, lambda: self._startup_mark("window"))
         self.root.mainloop()
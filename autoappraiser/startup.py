@@ -0,0 +1,105 @@
+import builtins
+import importlib.util
+import json
+import sys
+import threading
+import time
+
+
+class ImportTimer:
+    """
+    ``builtins.__import__`` hook that times the first import of every module,
+    like ``python -X importtime`` but also inside a frozen executable.
+
+    Each record is ``(module, self ms, cumulative ms, depth)``; self time
+    leaves out the nested imports the module triggered.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._original = None
+        self._local = threading.local()
+
+    def install(self):
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+        return self
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        full = name
+        if level:
+            try:
+                full = importlib.util.resolve_name("." * level + name, (globals or {}).get('__package__'))
+            except (ImportError, ValueError):
+                pass
+        if full in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            total = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += total
+            self.records.append((full, (total - children) * 1000, total * 1000, len(stack)))
+
+
+class StartupReport:
+    """
+    Cold-start timeline: time from launch to each ``mark``-ed phase plus the
+    import times collected by an ``ImportTimer`` installed at launch.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.started = time.perf_counter()
+        self.phases = []
+        self.imports = ImportTimer().install()
+
+    def mark(self, phase):
+        self.phases.append((phase, (time.perf_counter() - self.started) * 1000))
+
+    def snapshot(self, top=25):
+        imports = sorted(self.imports.records, key=lambda r: -r[2])
+        return {
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'phases_ms': {phase: round(ms, 1) for phase, ms in self.phases},
+            'import_total_ms': round(sum(r[1] for r in self.imports.records), 1),
+            'imports': [
+                {'module': m, 'self_ms': round(s, 2), 'cumulative_ms': round(c, 2)} for m, s, c, _ in imports[:top]
+            ],
+        }
+
+    def format(self, top=25):
+        snap = self.snapshot(top)
+        lines = [f"{'phase':<20}{'since launch':>14}"]
+        lines += [f"{phase:<20}{ms:>11.1f} ms" for phase, ms in snap['phases_ms'].items()]
+        lines.append("")
+        lines.append(f"Imports: {snap['import_total_ms']:.1f} ms in {len(self.imports.records)} modules")
+        lines.append(f"{'self ms':>9}{'cumul. ms':>11}  module")
+        lines += [f"{r['self_ms']:>9.2f}{r['cumulative_ms']:>11.2f}  {r['module']}" for r in snap['imports']]
+        return "\n".join(lines)
+
+    def write(self):
+        """Save the report (JSON when ``path`` ends in .json) and stop timing imports."""
+        self.imports.uninstall()
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                if self.path.endswith(".json"):
+                    json.dump(self.snapshot(), f, indent=2)
+                else:
+                    f.write(self.format() + "\n")
+        except OSError as e:
+            print(f"Failed to write startup report: {e}")
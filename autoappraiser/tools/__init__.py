@@ -0,0 +1,6 @@
+"""
+Developer Tools
+
+Headless command line tools for measuring and tuning the appraisal pipeline.
+Each module is runnable with ``python -m autoappraiser.tools.<name>``.
+"""
@@ -0,0 +1,364 @@
+"""
+Per-stage benchmark for the appraisal pipeline.
+
+Times every stage of the capture -> filter -> OCR -> match loop on its own
+over a corpus of recorded capture-box frames and reports p50/p95/p99 latency
+and the peak memory allocated per call. Runs headless on any platform with a
+fake OCR engine; stages that need WinRT fall back to their portable half when
+it is unavailable.
+
+Usage:
+    python -m autoappraiser.tools.bench [--corpus DIR] [--iterations N] [--json]
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+from rapidfuzz import process
+
+from autoappraiser.tools.corpus import default_mutations, load_corpus, save_corpus, synthetic_corpus
+from autoappraiser.utils.capture_backends import ReplayBackend, probe_backends
+from autoappraiser.utils import ocr_engines
+from autoappraiser.utils.mask_gate import MaskGate
+from autoappraiser.utils.matcher import MutationMatcher
+from autoappraiser.utils.metrics import Metrics
+from autoappraiser.utils.ocr_cache import OcrCache
+from autoappraiser.utils.ocr_engines import BGRA8, FakeOcrEngine, WinRtOcrEngine, to_engine_pixels
+from autoappraiser.utils.ocr_handler import OcrHandler
+from autoappraiser.utils.ocr_service import OcrService
+from autoappraiser.utils.scheduler import ActionScheduler, FakeInput, click, move, wait
+from autoappraiser.utils.text_filter import TextFilter
+from autoappraiser.utils.text_roi import TextRoi
+from autoappraiser.utils.text_templates import TextTemplateIndex
+
+
+def legacy_png_bitmap(img, loop):
+    """The PNG encode -> BitmapDecoder conversion recognize_frame used to do, for comparison."""
+    pil_img = Image.fromarray(img).convert("RGB")
+    img_byte_arr = io.BytesIO()
+    pil_img.save(img_byte_arr, format='PNG')
+    img_bytes = img_byte_arr.getvalue()
+    if ocr_engines.imaging is None:
+        return img_bytes
+
+    async def decode():
+        streams = ocr_engines.streams
+        stream = streams.InMemoryRandomAccessStream()
+        writer = streams.DataWriter(stream.get_output_stream_at(0))
+        writer.write_bytes(img_bytes)
+        await writer.store_async()
+        decoder = await ocr_engines.imaging.BitmapDecoder.create_async(stream)
+        return await decoder.get_software_bitmap_async()
+
+    return loop.run_until_complete(decode())
+
+
+class StagedConvert:
+    """
+    Portable half of ``WinRtOcrEngine.make_bitmap``: the pixel conversion and
+    the copy into a reused per-size staging buffer, minus the WinRT wrapping.
+    """
+
+    def __init__(self, pixel_format=BGRA8):
+        self.pixel_format = pixel_format
+        self._staging = {}
+
+    def __call__(self, img):
+        pixels = to_engine_pixels(img, self.pixel_format)
+        buf = self._staging.get(pixels.nbytes)
+        if buf is None:
+            buf = self._staging[pixels.nbytes] = np.empty(pixels.nbytes, dtype=np.uint8)
+        np.copyto(buf.reshape(pixels.shape), pixels)
+        return buf
+
+
+class _FakeVar:
+    """Stands in for a tkinter BooleanVar in the legacy match stage."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class StageResult:
+    def __init__(self, name, samples_ns, alloc_bytes):
+        self.name = name
+        self.samples_ns = samples_ns
+        self.alloc_bytes = alloc_bytes
+
+    def summary(self):
+        ms = [s / 1e6 for s in self.samples_ns]
+        cuts = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+        return {
+            "stage": self.name,
+            "calls": len(ms),
+            "mean_ms": statistics.fmean(ms),
+            "p50_ms": cuts[49],
+            "p95_ms": cuts[94],
+            "p99_ms": cuts[98],
+            "alloc_kib": statistics.fmean(self.alloc_bytes) / 1024 if self.alloc_bytes else 0.0,
+        }
+
+
+def run_stage(name, fn, inputs, iterations, warmup=5):
+    """Call ``fn`` over ``inputs`` round-robin, timing each call separately."""
+    for i in range(min(warmup, iterations)):
+        fn(inputs[i % len(inputs)])
+
+    samples = []
+    clock = time.perf_counter_ns
+    for i in range(iterations):
+        item = inputs[i % len(inputs)]
+        start = clock()
+        fn(item)
+        samples.append(clock() - start)
+
+    # Allocation pass is separate so tracemalloc overhead doesn't skew timings
+    allocs = []
+    tracemalloc.start()
+    try:
+        for item in inputs:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            fn(item)
+            allocs.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+
+    return StageResult(name, samples, allocs)
+
+
+def build_stages(handler, engine, loop, service, corpus):
+    """Return ``(name, fn, inputs)`` for every stage, fed with realistic inputs."""
+    frames = [frame for _, frame, _ in corpus]
+    filtered = [handler.frame_to_array(frame)[0].copy() for frame in frames]
+    texts = [label for _, _, label in corpus]
+    lists = default_mutations()
+
+    legacy_name = "convert (legacy png)" if ocr_engines.load_winrt() else "convert (legacy, enc)"
+
+    def convert(img):
+        return engine.make_bitmap(to_engine_pixels(img, engine.pixel_format))
+
+    if isinstance(engine, WinRtOcrEngine):
+        convert_names, raw_convert = ("convert (raw)", "convert (roi crop)"), convert
+    else:
+        # The fake engine's make_bitmap does nothing; time the work WinRT's would do short of the bitmap itself
+        convert_names, raw_convert = ("convert (raw staged)", "convert (crop staged)"), StagedConvert()
+
+    roi = TextRoi()
+    cropped = [roi.crop(img, roi.locate(img)) for img in filtered]
+    tracker = TextRoi()
+    templates = TextTemplateIndex()
+    for img, label in zip(cropped, texts):
+        templates.learn(img, label)
+
+    def filter_tracked(frame):
+        return tracker.mask(handler.text_filter, frame)
+
+    # The OCR stage times only the engine call on already-converted bitmaps
+    labelled = list(zip([convert(img) for img in filtered], texts))
+
+    def ocr(item):
+        bitmap, label = item
+        engine.text = label
+        return loop.run_until_complete(engine.recognize(bitmap))
+
+    def recognize(item):
+        frame, label = item
+        engine.text = label
+        return loop.run_until_complete(handler.recognize_frame(engine, frame))
+
+    def dispatch_asyncio_run(item):
+        bitmap, label = item
+        engine.text = label
+        return asyncio.run(engine.recognize(bitmap))
+
+    def dispatch_service(item):
+        bitmap, label = item
+        engine.text = label
+        return service.run(engine.recognize(bitmap))
+
+    # Matching sees clean labels plus OCR-style misreads of them
+    match_texts = texts + [t[:-1] + "1" for t in texts if t]
+    checkbox_vars = {desc: _FakeVar(desc == lists[0]) for desc in lists}
+    matcher = MutationMatcher(lists, [lists[0]])
+
+    def match_legacy(text):
+        # Mirrors the old appraise_worker: copy + append + extractOne + selection rebuild
+        mutations = lists.copy()
+        mutations.append("Mutated")
+        result = process.extractOne(text, mutations)[0]
+        selected_lists = [desc for desc, var in checkbox_vars.items() if var.get()]
+        return result in selected_lists
+
+    def match(text):
+        return bool(matcher.kept(matcher.match_all(text)))
+
+    metrics = Metrics()
+
+    def metrics_span(_):
+        with metrics.span("bench"):
+            pass
+
+    replay = ReplayBackend(frames=frames)
+    region = (0, 0, frames[0].shape[1], frames[0].shape[0])
+
+    return [
+        ("capture (replay)", lambda _: replay.grab(region), frames),
+        ("filter (legacy)", handler.apply_green_filter, frames),
+        ("filter (lut mask)", handler.text_filter.mask, frames),
+        ("filter (lut color)", handler.text_filter.apply, frames),
+        ("filter (roi tracked)", filter_tracked, frames),
+        ("roi crop", lambda img: roi.crop(img, roi.locate(img)), filtered),
+        (legacy_name, lambda img: legacy_png_bitmap(img, loop), filtered),
+        (convert_names[0], raw_convert, filtered),
+        (convert_names[1], raw_convert, cropped),
+        ("ocr", ocr, labelled),
+        ("recognize_frame", recognize, list(zip(frames, texts))),
+        ("cache key", OcrCache().key, filtered),
+        ("mask gate", MaskGate().accept, filtered),
+        ("template classify", templates.classify, cropped),
+        ("dispatch (asyncio.run)", dispatch_asyncio_run, labelled),
+        ("dispatch (service)", dispatch_service, labelled),
+        ("match (legacy)", match_legacy, match_texts),
+        ("match (matcher)", match, match_texts),
+        ("metrics span", metrics_span, frames),
+    ]
+
+
+def appraisal_timeline(interval):
+    """The appraise_normal click timeline (without the trigger) as scheduler steps."""
+    pair = [move(0, 0), click(), wait(0.2), move(0, 0), click()]
+    return pair + [wait(interval)] + pair + [wait(interval)]
+
+
+def run_chained(steps, backend):
+    """How Actions used to run a timeline: each wait is a plain sleep after the previous call."""
+    for kind, args in steps:
+        if kind == "wait":
+            time.sleep(args[0])
+        else:
+            getattr(backend, kind)(*args)
+
+
+def timeline_errors(steps, events, start):
+    """Absolute error of each recorded action against its intended offset from ``start``."""
+    offsets = []
+    offset = 0.0
+    for kind, args in steps:
+        if kind == "wait":
+            offset += args[0]
+        else:
+            offsets.append(offset)
+    return [abs((t - start) - o) * 1000 for (t, _, _), o in zip(events, offsets)]
+
+
+def compare_timelines(repeats, interval, input_delay):
+    """Per-action timing error (ms) of chained sleeps vs the deadline scheduler."""
+    steps = appraisal_timeline(interval)
+    results = {}
+    for name in ("chained sleeps", "scheduler"):
+        errors = []
+        for _ in range(repeats):
+            backend = FakeInput(delay=input_delay)
+            start = time.monotonic()
+            if name == "scheduler":
+                ActionScheduler(backend).run(steps)
+            else:
+                run_chained(steps, backend)
+            errors += timeline_errors(steps, backend.events, start)
+        cuts = statistics.quantiles(errors, n=100, method="inclusive")
+        results[name] = {"mean_ms": statistics.fmean(errors), "p95_ms": cuts[94], "max_ms": max(errors)}
+    return results
+
+
+def print_table(rows):
+    header = f"{'stage':<24}{'calls':>7}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'alloc KiB':>12}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['stage']:<24}{r['calls']:>7}{r['mean_ms']:>10.3f}{r['p50_ms']:>10.3f}"
+            f"{r['p95_ms']:>10.3f}{r['p99_ms']:>10.3f}{r['alloc_kib']:>12.1f}"
+        )
+    print("(latencies in ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-stage appraisal pipeline benchmark")
+    parser.add_argument("--corpus", help="directory of recorded capture-box frames (default: synthetic)")
+    parser.add_argument("--iterations", type=int, default=500, help="timed calls per stage")
+    parser.add_argument("--engine", choices=["fake", "winrt"], default="fake", help="OCR engine to drive")
+    parser.add_argument("--ocr-delay-ms", type=float, default=0.0, help="simulated fake engine latency")
+    parser.add_argument("--stage", action="append", help="only run stages whose name starts with this")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--probe", metavar="L,T,R,B", help="time grabs of a screen region on each live capture backend")
+    parser.add_argument("--write-synthetic", metavar="DIR", help="save the synthetic corpus as PNGs (e.g. for REPLAY mode)")
+    parser.add_argument("--timeline", action="store_true", help="compare action timing of chained sleeps vs the scheduler")
+    parser.add_argument("--interval-ms", type=float, default=100.0, help="loop interval used by --timeline")
+    parser.add_argument("--input-delay-ms", type=float, default=10.0, help="simulated cost of one input call for --timeline")
+    args = parser.parse_args(argv)
+
+    if args.timeline:
+        repeats = max(1, args.iterations // 50)
+        results = compare_timelines(repeats, args.interval_ms / 1000, args.input_delay_ms / 1000)
+        for name, r in results.items():
+            print(f"{name:<16}mean {r['mean_ms']:>8.3f}  p95 {r['p95_ms']:>8.3f}  max {r['max_ms']:>8.3f} ms off schedule")
+        return
+
+    if args.probe:
+        region = tuple(int(v) for v in args.probe.split(","))
+        for name, ms in probe_backends(region, samples=args.iterations):
+            print(f"{name:<8}{ms:>10.3f} ms/frame")
+        return
+
+    if args.write_synthetic:
+        save_corpus(synthetic_corpus(), args.write_synthetic)
+        print(f"Wrote synthetic corpus to {args.write_synthetic}")
+        return
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    handler = OcrHandler()
+    handler.text_filter = TextFilter()
+    handler.text_filter.lut  # built once up front, not inside a timed stage
+    handler.text_roi = TextRoi()
+    handler.use_roi = True
+    if args.engine == "winrt":
+        engine = WinRtOcrEngine.create()
+        engine.text = ""  # labels are ignored by the real engine
+    else:
+        engine = FakeOcrEngine(delay=args.ocr_delay_ms / 1000)
+    loop = asyncio.new_event_loop()
+    service = OcrService().start()
+
+    rows = []
+    try:
+        for name, fn, inputs in build_stages(handler, engine, loop, service, corpus):
+            if args.stage and not any(name.startswith(s) for s in args.stage):
+                continue
+            rows.append(run_stage(name, fn, inputs, args.iterations).summary())
+    finally:
+        service.stop()
+        loop.close()
+
+    if args.json:
+        json.dump({"frames": len(corpus), "iterations": args.iterations, "stages": rows}, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"Corpus: {args.corpus or 'synthetic'} ({len(corpus)} frames)")
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
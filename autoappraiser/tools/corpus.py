@@ -0,0 +1,71 @@
+import os
+
+import cv2
+import numpy as np
+
+from autoappraiser.utils.capture_backends import IMAGE_EXTENSIONS, load_frame_file
+from autoappraiser.utils.config import Config
+
+EMPTY_LABEL = "none"
+
+
+def default_mutations():
+    """Mutation names the app ships with, including the late additions."""
+    lists = list(Config.DEFAULT_CONFIG['mutations']['lists'])
+    for mutation in Config.NEW_MUTATIONS:
+        if mutation not in lists:
+            lists.append(mutation)
+    return lists
+
+
+def label_from_name(filename):
+    """Frames are named ``<label>_<anything>.<ext>``; the label is the OCR ground truth."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    label = stem.split("_", 1)[0]
+    return "" if label.lower() == EMPTY_LABEL else label
+
+
+def load_corpus(directory):
+    """Return a sorted list of ``(name, frame, label)`` from a frame directory."""
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        path = os.path.join(directory, name)
+        corpus.append((name, load_frame_file(path), label_from_name(name)))
+    if not corpus:
+        raise ValueError(f"No frames found in {directory}")
+    return corpus
+
+
+def render_frame(text, width=326, height=98, seed=0):
+    """Render a capture-box sized frame with ``text`` in the appraisal green."""
+    rng = np.random.default_rng(seed)
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:] = (38, 44, 58)
+    frame += rng.integers(0, 12, size=frame.shape, dtype=np.uint8)
+    if text:
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        (tw, th), _ = cv2.getTextSize(text, font, 0.9, 2)
+        org = (max(0, (width - tw) // 2), (height + th) // 2)
+        cv2.putText(frame, text, org, font, 0.9, (90, 230, 80), 2, cv2.LINE_AA)
+    return frame
+
+
+def synthetic_corpus(width=326, height=98, copies=1):
+    """Stand-in corpus used when no recorded frames are available; ``copies`` frames per label differ in noise."""
+    corpus = []
+    for i, text in enumerate(default_mutations() + ["Mutated", ""]):
+        label = text or EMPTY_LABEL
+        for j in range(copies):
+            suffix = "" if copies == 1 else str(j)
+            frame = render_frame(text, width, height, seed=i * copies + j)
+            corpus.append((f"{label}_synthetic{suffix}.png", frame, text))
+    return corpus
+
+
+def save_corpus(corpus, directory):
+    """Write ``(name, frame, label)`` entries as PNG files so they can be reloaded."""
+    os.makedirs(directory, exist_ok=True)
+    for name, frame, _ in corpus:
+        cv2.imwrite(os.path.join(directory, name), cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
@@ -0,0 +1,276 @@
+"""
+Accuracy and throughput evaluation over a labelled frame corpus.
+
+Runs every frame through the app's recognition path (colour filter -> text
+crop -> mask gate -> OCR -> matcher) for one configuration and reports the
+decision accuracy, the confusion between expected and detected mutations and
+frames per second. ``--sweep`` evaluates the product of parameter grids
+across a process pool and prints the configurations on the accuracy / fps
+Pareto front.
+
+``--ocr winrt`` reads frames with Windows OCR. ``--ocr templates`` is a
+portable stand-in: frames are split into two folds and each fold is read by
+a text template index learned from the other, so it measures how well the
+filter and crop separate the names rather than the engine itself.
+
+Usage:
+    python -m autoappraiser.tools.evaluate [--corpus DIR] [--ocr templates|winrt] [--set NAME=VALUE ...]
+                                           [--sweep NAME=V1,V2,... ...] [--jobs N] [--json]
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+
+from autoappraiser.tools.corpus import EMPTY_LABEL, default_mutations, load_corpus, synthetic_corpus
+from autoappraiser.utils import ocr_engines
+from autoappraiser.utils.config import Config
+from autoappraiser.utils.mask_gate import MaskGate
+from autoappraiser.utils.matcher import MutationMatcher
+from autoappraiser.utils.ocr_engines import GRAY8, OcrEngine, WinRtOcrEngine
+from autoappraiser.utils.ocr_handler import OcrHandler
+from autoappraiser.utils.text_filter import TextFilter
+from autoappraiser.utils.text_roi import TextRoi
+from autoappraiser.utils.text_templates import TextTemplateIndex
+
+RANGE_KEYS = ('h_lo', 's_lo', 'v_lo', 'h_hi', 's_hi', 'v_hi')
+
+# Everything --set and --sweep can change; the colour bounds are the first row of color_ranges
+DEFAULT_PARAMS = dict(zip(RANGE_KEYS, Config.DEFAULT_CONFIG['ocr']['color_ranges'][0]))
+DEFAULT_PARAMS.update({
+    'roi': Config.DEFAULT_CONFIG['ocr']['roi'],
+    'text_height': Config.DEFAULT_CONFIG['ocr']['text_height'],
+    'gate': True,
+    'token_cutoff': 80,
+    'text_cutoff': 60,
+})
+
+
+def parse_value(name, value):
+    if name not in DEFAULT_PARAMS:
+        raise ValueError(f"Unknown parameter {name!r} (choose from {', '.join(DEFAULT_PARAMS)})")
+    if isinstance(DEFAULT_PARAMS[name], bool):
+        return value.lower() in ("1", "true", "yes", "on")
+    return type(DEFAULT_PARAMS[name])(value)
+
+
+def parse_assignments(items, multi):
+    """``NAME=VALUE`` (or ``NAME=V1,V2`` when ``multi``) strings into a dict."""
+    result = {}
+    for item in items or ():
+        name, _, value = item.partition("=")
+        values = [parse_value(name, v) for v in value.split(",")] if multi else parse_value(name, value)
+        result[name] = values
+    return result
+
+
+def grid(base, sweep):
+    """Every combination of the swept values on top of ``base``."""
+    names = list(sweep)
+    for values in itertools.product(*(sweep[n] for n in names)):
+        params = dict(base)
+        params.update(zip(names, values))
+        yield params
+
+
+class TemplateEngine(OcrEngine):
+    """OCR engine that answers from a ``TextTemplateIndex`` (empty text when unsure)."""
+    pixel_format = GRAY8
+
+    def __init__(self):
+        self.index = None
+
+    def make_bitmap(self, pixels):
+        return pixels
+
+    async def recognize(self, bitmap):
+        found = self.index.classify(bitmap)
+        return found[0] if found else ""
+
+
+class Evaluator(OcrHandler):
+    """One configuration of the recognition path, run a frame at a time."""
+
+    def __init__(self, params, engine):
+        self.params = params
+        lower = tuple(params[k] for k in RANGE_KEYS[:3])
+        upper = tuple(params[k] for k in RANGE_KEYS[3:])
+        self.text_filter = TextFilter(((lower, upper),))
+        self.text_filter.lut  # built up front, not inside the timed loop
+        self.text_roi = TextRoi(params['text_height'])
+        self.use_roi = params['roi']
+        self.mask_gate = MaskGate() if params['gate'] else None
+        self.matcher = MutationMatcher(default_mutations(),
+                                       token_cutoff=params['token_cutoff'], text_cutoff=params['text_cutoff'])
+        self.engine = engine
+        self.loop = asyncio.new_event_loop()
+
+    def crop(self, frame):
+        mask, is_bgra = self.frame_to_array(frame)
+        img = self.text_roi.crop(mask, self.text_roi.locate(mask)) if self.use_roi else mask
+        return mask, img, is_bgra
+
+    def read(self, frame):
+        """``(text, detected mutation or None)`` for one frame."""
+        mask, img, is_bgra = self.crop(frame)
+        stats = None
+        if self.mask_gate is not None:
+            accepted, stats = self.mask_gate.accept(mask)
+            if not accepted:
+                return "", None
+        text = self.loop.run_until_complete(self.recognize_array(self.engine, img, is_bgra))
+        if stats is not None:
+            self.mask_gate.learn(stats, text)
+        return text, self.matcher.match(text)
+
+    def close(self):
+        self.loop.close()
+
+
+def evaluate(params, corpus, ocr="templates", repeat=3):
+    """Accuracy, confusion and throughput of one configuration over ``corpus``."""
+    engine = TemplateEngine() if ocr == "templates" else WinRtOcrEngine.create()
+    evaluator = Evaluator(params, engine)
+    indices = []
+    if ocr == "templates":
+        # Two folds, each read by templates learned from the other one
+        indices = [TextTemplateIndex(), TextTemplateIndex()]
+        for i, (_, frame, label) in enumerate(corpus):
+            if label:
+                indices[i % 2].learn(evaluator.crop(frame)[1], label)
+
+    confusion = defaultdict(Counter)
+    elapsed = 0.0
+    try:
+        for attempt in range(repeat):
+            for i, (_, frame, label) in enumerate(corpus):
+                if indices:
+                    engine.index = indices[1 - i % 2]
+                start = time.perf_counter()
+                _, detected = evaluator.read(frame)
+                elapsed += time.perf_counter() - start
+                if attempt == repeat - 1:
+                    confusion[label or EMPTY_LABEL][detected or EMPTY_LABEL] += 1
+    finally:
+        evaluator.close()
+
+    correct = sum(row[expected] for expected, row in confusion.items())
+    return {
+        'params': params,
+        'frames': len(corpus),
+        'accuracy': correct / len(corpus),
+        'fps': len(corpus) * repeat / elapsed if elapsed else 0.0,
+        'confusion': {expected: dict(row) for expected, row in sorted(confusion.items())},
+    }
+
+
+_worker = {}
+
+
+def _init_worker(corpus, ocr, repeat):
+    _worker.update(corpus=corpus, ocr=ocr, repeat=repeat)
+
+
+def _evaluate_in_worker(params):
+    return evaluate(params, _worker['corpus'], _worker['ocr'], _worker['repeat'])
+
+
+def sweep(configs, corpus, ocr, repeat, jobs):
+    """Evaluate ``configs`` across ``jobs`` processes; results come back in input order."""
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(corpus, ocr, repeat)) as pool:
+        return list(pool.map(_evaluate_in_worker, configs))
+
+
+def pareto_front(results):
+    """Results no other result beats on both accuracy and fps, best accuracy first."""
+    front = []
+    for r in results:
+        dominated = any(
+            o['accuracy'] >= r['accuracy'] and o['fps'] >= r['fps']
+            and (o['accuracy'] > r['accuracy'] or o['fps'] > r['fps'])
+            for o in results
+        )
+        if not dominated:
+            front.append(r)
+    return sorted(front, key=lambda r: (-r['accuracy'], -r['fps']))
+
+
+def changed(params):
+    """The parameters that differ from the app defaults, as ``name=value``."""
+    diff = [f"{k}={v}" for k, v in params.items() if v != DEFAULT_PARAMS[k]]
+    return " ".join(diff) or "(defaults)"
+
+
+def print_result(result):
+    confusion = result['confusion']
+    print(f"Accuracy {result['accuracy']:.1%} over {result['frames']} frames, {result['fps']:.1f} fps")
+    print(f"{'expected':<16}{'frames':>7}{'recall':>8}  detected instead")
+    for expected, row in confusion.items():
+        total = sum(row.values())
+        wrong = ", ".join(f"{d} x{n}" for d, n in sorted(row.items(), key=lambda kv: -kv[1]) if d != expected)
+        print(f"{expected:<16}{total:>7}{row.get(expected, 0) / total:>8.0%}  {wrong}")
+
+
+def print_sweep(results, front):
+    print(f"{'accuracy':>9}{'fps':>10}  parameters")
+    for r in sorted(results, key=lambda r: (-r['accuracy'], -r['fps'])):
+        mark = "*" if r in front else " "
+        print(f"{r['accuracy']:>9.1%}{r['fps']:>10.1f} {mark}{changed(r['params'])}")
+    print(f"* Pareto-optimal ({len(front)} of {len(results)})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate recognition accuracy and speed on a labelled corpus")
+    parser.add_argument("--corpus", help="directory of labelled capture-box frames (default: synthetic)")
+    parser.add_argument("--copies", type=int, default=4, help="frames per label in the synthetic corpus")
+    parser.add_argument("--ocr", choices=["templates", "winrt"], default="templates", help="recognition backend")
+    parser.add_argument("--set", action="append", metavar="NAME=VALUE", help="override one parameter")
+    parser.add_argument("--sweep", action="append", metavar="NAME=V1,V2", help="values to sweep for one parameter")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus per configuration")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes for --sweep")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.ocr == "winrt" and not ocr_engines.load_winrt():
+        parser.error("Windows OCR is not available on this platform; use --ocr templates")
+    try:
+        base = dict(DEFAULT_PARAMS)
+        base.update(parse_assignments(args.set, multi=False))
+        grids = parse_assignments(args.sweep, multi=True)
+    except ValueError as e:
+        parser.error(str(e))
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(copies=args.copies)
+
+    if not grids:
+        result = evaluate(base, corpus, args.ocr, args.repeat)
+        if args.json:
+            json.dump(result, sys.stdout, indent=2)
+            print()
+        else:
+            print(f"Corpus: {args.corpus or 'synthetic'}  OCR: {args.ocr}  {changed(base)}")
+            print_result(result)
+        return
+
+    configs = list(grid(base, grids))
+    start = time.perf_counter()
+    results = sweep(configs, corpus, args.ocr, args.repeat, args.jobs)
+    front = pareto_front(results)
+    if args.json:
+        json.dump({'results': results, 'pareto': [results.index(r) for r in front]}, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"Corpus: {args.corpus or 'synthetic'}  OCR: {args.ocr}  "
+              f"{len(configs)} configurations in {time.perf_counter() - start:.1f} s on {args.jobs} processes")
+        print_sweep(results, front)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Offline report over an appraisal session log.
+
+Streams the JSON-lines log written by ``SessionLog`` one record at a time, so
+logs of any size run in constant memory, and prints mutation frequencies,
+throughput per time bucket and per-stage latency distributions. Latency
+percentiles come from log-spaced bins (about 3% wide), not stored samples.
+
+Usage:
+    python -m autoappraiser.tools.session_report appraisals.jsonl [--bucket-min 10] [--json]
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from collections import Counter, defaultdict
+
+
+class LogHistogram:
+    """Streaming histogram with ``per_decade`` logarithmic bins between 1 us and 100 s."""
+
+    def __init__(self, per_decade=80, low_ms=0.001, high_ms=100000.0):
+        self.per_decade = per_decade
+        self.low = math.log10(low_ms)
+        self.bins = [0] * (int((math.log10(high_ms) - self.low) * per_decade) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        if ms <= 0:
+            index = 0
+        else:
+            index = int((math.log10(ms) - self.low) * self.per_decade)
+        self.bins[min(max(index, 0), len(self.bins) - 1)] += 1
+
+    def percentile(self, p):
+        target = p * self.count
+        seen = 0
+        for index, n in enumerate(self.bins):
+            seen += n
+            if n and seen >= target:
+                # Upper edge of the bin, capped by the largest value seen
+                return min(10 ** (self.low + (index + 1) / self.per_decade), self.max)
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'mean': self.total / self.count,
+            'p50': self.percentile(0.50),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'max': self.max,
+        }
+
+
+def read_records(path):
+    """Yield ``(line_number, record)`` for every parseable line of the log."""
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError:
+                # A crash can leave a half-written last line
+                yield number, None
+
+
+def analyse(records, bucket_s=600):
+    mutations = Counter()
+    buckets = Counter()
+    stages = defaultdict(LogHistogram)
+    totals = Counter()
+    first = last = None
+
+    for _, record in records:
+        if record is None:
+            totals['malformed'] += 1
+            continue
+        totals['appraisals'] += 1
+        if record.get('skipped'):
+            totals['ocr_skipped'] += 1
+        if record.get('kept'):
+            totals['kept'] += 1
+        mutations[record.get('match') or "(none)"] += 1
+
+        t = record.get('t')
+        if t is not None:
+            first = t if first is None else min(first, t)
+            last = t if last is None else max(last, t)
+            buckets[int(t // bucket_s) * bucket_s] += 1
+
+        for stage, ms in (record.get('ms') or {}).items():
+            stages[stage].add(ms)
+
+    span_h = (last - first) / 3600 if first is not None and last > first else 0.0
+    return {
+        'totals': dict(totals),
+        'start': first,
+        'end': last,
+        'appraisals_per_hour': totals['appraisals'] / span_h if span_h else 0.0,
+        'mutations': dict(mutations.most_common()),
+        'throughput': {str(start): n * 3600 / bucket_s for start, n in sorted(buckets.items())},
+        'stages_ms': {stage: h.summary() for stage, h in sorted(stages.items())},
+    }
+
+
+def print_report(report, bucket_s):
+    totals = report['totals']
+    print(f"Appraisals: {totals.get('appraisals', 0)}  kept: {totals.get('kept', 0)}  "
+          f"OCR skipped: {totals.get('ocr_skipped', 0)}  malformed lines: {totals.get('malformed', 0)}")
+    if report['start'] is not None:
+        start = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(report['start']))
+        end = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(report['end']))
+        print(f"From {start} to {end}, {report['appraisals_per_hour']:.0f} appraisals/hour")
+
+    print("\nMutation frequency")
+    count = max(1, totals.get('appraisals', 0))
+    for name, n in report['mutations'].items():
+        print(f"  {name:<20}{n:>8}{n / count:>8.1%}")
+
+    print(f"\nThroughput (appraisals/hour per {bucket_s // 60} min)")
+    for start, rate in report['throughput'].items():
+        print(f"  {time.strftime('%Y-%m-%d %H:%M', time.localtime(float(start)))}{rate:>10.0f}")
+
+    print("\nStage latency (ms)")
+    print(f"  {'stage':<12}{'count':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for stage, s in report['stages_ms'].items():
+        print(f"  {stage:<12}{s['count']:>8}{s['mean']:>10.2f}{s['p50']:>10.2f}"
+              f"{s['p95']:>10.2f}{s['p99']:>10.2f}{s['max']:>10.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise an appraisal session log")
+    parser.add_argument("log", help="JSON-lines session log (appraise.session_log in config.toml)")
+    parser.add_argument("--bucket-min", type=int, default=10, help="throughput bucket size in minutes")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    bucket_s = max(1, args.bucket_min) * 60
+    report = analyse(read_records(args.log), bucket_s)
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report, bucket_s)
+
+
+if __name__ == "__main__":
+    main()
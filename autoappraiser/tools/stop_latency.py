@@ -0,0 +1,135 @@
+"""
+Stop-latency check for the appraisal loop.
+
+Runs the app's real ``appraise_worker`` (totem, click timeline, text wait,
+pipeline submit, waiting on the previous decision and the lane scheduler's
+sleep) on an ``AutoAppraiser.headless`` app with a fake input backend, a
+fake OCR engine and a replayed screen where appraisal text comes and goes. It starts and stops
+the loop through ``_toggle_action`` at random moments and measures how long
+the worker takes to park (``worker_idle``, which is what the app waits for
+after a stop) and whether any input was sent after the stop. Exits non-zero
+when the worst case exceeds ``--bound-ms``, any input followed a stop, or no
+appraisal ran at all.
+
+Usage:
+    python -m autoappraiser.tools.stop_latency [--trials 30] [--bound-ms 50] [--input-delay-ms 10]
+"""
+
+import argparse
+import copy
+import random
+import statistics
+import sys
+import threading
+import time
+
+import numpy as np
+
+from autoappraiser.auto_appraiser import AutoAppraiser
+from autoappraiser.tools.corpus import default_mutations, synthetic_corpus
+from autoappraiser.utils.capture_backends import ReplayBackend
+from autoappraiser.utils.ocr_engines import FakeOcrEngine
+from autoappraiser.utils.scheduler import ActionScheduler, FakeInput
+
+# Replayed screen: this many frames without text, then this many with it, at REPLAY_FPS
+BLANK_FRAMES = 20
+TEXT_FRAMES = 40
+REPLAY_FPS = 100
+# Minutes a totem lasts: the first cycle of a run uses it, the rest are appraisals
+TOTEM_INTERVAL = 1
+# Every this many trials the totem is made due again
+TOTEM_EVERY = 3
+
+
+def build_app(interval, input_delay, ocr_delay, auto_totem):
+    """A headless ``AutoAppraiser`` on a replayed screen, fake input and a fake OCR engine."""
+    _, text_frame, label = next(sample for sample in synthetic_corpus() if sample[2])
+
+    config = copy.deepcopy(AutoAppraiser.DEFAULT_CONFIG)
+    config['ocr'].update(
+        capture_mode=ReplayBackend.name, capture_x=0, capture_y=0,
+        capture_width=text_frame.shape[1], capture_height=text_frame.shape[0],
+        cache_size=0, cache_file='', template_file='',
+    )
+    config['appraise'].update(
+        loop_interval=interval * 1000, adaptive_timing=False, auto_totem=auto_totem,
+        totem_interval=TOTEM_INTERVAL, session_log='', stop_timeout_ms=1000,
+    )
+    # Nothing is kept, so the loop only ever ends by being stopped
+    config['mutations']['lists'] = default_mutations()
+    app = AutoAppraiser.headless(config)
+
+    # What _warm_up would create, with fakes in place of the screen, input and OCR
+    blank = np.zeros_like(text_frame)
+    app.camera = ReplayBackend(frames=[blank] * BLANK_FRAMES + [text_frame] * TEXT_FRAMES, replay_fps=REPLAY_FPS)
+    app.capture_backend = ReplayBackend.name
+    app.scheduler = ActionScheduler(FakeInput(delay=input_delay))
+    app.ocr_engine = FakeOcrEngine(text=label, delay=ocr_delay)
+    app.text_filter.lut
+    app.lanes[0].anchor = (100, 100)
+    app.ready.set()
+    return app
+
+
+def measure(app, trials, max_run, seed=0):
+    """Stop ``trials`` runs at random times; return stop latencies (ms) and inputs sent after stop."""
+    rng = random.Random(seed)
+    latencies = []
+    late_inputs = 0
+    for trial in range(trials):
+        if trial % TOTEM_EVERY == 0:
+            # Start this run with a totem use, so stops also land inside one
+            for lane in app.lanes:
+                lane.totem_planner.reset()
+        events = app.scheduler.backend.events
+        events.clear()
+        app._toggle_action()  # start
+        time.sleep(rng.uniform(0, max_run))
+        stop_pressed = time.monotonic()
+        app._toggle_action()  # stop
+        # Once the stop has gone through, not a single input may follow
+        stopped_at = time.monotonic()
+        if not app.worker_idle.wait(5):
+            raise RuntimeError("worker did not stop within 5 s")
+        latencies.append((time.monotonic() - stop_pressed) * 1000)
+        late_inputs += sum(1 for t, _, _ in events if t > stopped_at)
+    return latencies, late_inputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure how fast the appraisal loop stops")
+    parser.add_argument("--trials", type=int, default=30)
+    parser.add_argument("--bound-ms", type=float, default=50.0, help="fail if any stop takes longer")
+    parser.add_argument("--interval-ms", type=float, default=500.0, help="loop interval the clicks wait")
+    parser.add_argument("--input-delay-ms", type=float, default=10.0, help="simulated cost of one input call")
+    parser.add_argument("--ocr-delay-ms", type=float, default=30.0, help="simulated time of one OCR call")
+    parser.add_argument("--no-totem", action="store_true", help="leave the totem sequence out of the cycle")
+    args = parser.parse_args(argv)
+
+    app = build_app(args.interval_ms / 1000, args.input_delay_ms / 1000, args.ocr_delay_ms / 1000,
+                    not args.no_totem)
+    app.pipeline.start()
+    threading.Thread(target=app.appraise_worker, name="appraise-worker", daemon=True).start()
+    app.worker_idle.wait(1)
+    # Long enough to land anywhere in a totem + appraisal cycle
+    max_run = 2 * args.interval_ms / 1000 + 4
+    try:
+        latencies, late_inputs = measure(app, args.trials, max_run)
+    finally:
+        app.pipeline.stop()
+        app.ocr_service.stop()
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    worst = max(latencies)
+    print(f"Stops: {len(latencies)}  p50 {cuts[49]:.2f} ms  p99 {cuts[98]:.2f} ms  max {worst:.2f} ms")
+    appraisals = app.metrics.snapshot()['counters'].get('appraisals', 0)
+    print(f"Appraisals: {appraisals}  inputs sent after stop: {late_inputs}")
+    if appraisals == 0:
+        print("No appraisal ran, so the stops were never measured inside one")
+    ok = worst <= args.bound_ms and late_inputs == 0 and appraisals > 0
+    print(f"{'PASS' if ok else 'FAIL'} (bound {args.bound_ms:.0f} ms)")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+In-thread vs out-of-process filter/OCR benchmark.
+
+Reads every corpus frame the way the pipeline does (filter + text crop, then
+OCR) either on threads of this process or in ``ProcessOcr`` worker
+processes, and reports per-frame latency. While it runs, a ticker thread
+stands in for the GUI mainloop and input timeline: it wakes every
+``--tick-ms`` and records how late each wake-up is, which is the stutter the
+shared GIL causes. The fake engine's ``--ocr-busy-ms`` is Python work that
+holds the GIL, like the OCR engine's marshalling.
+
+Usage:
+    python -m autoappraiser.tools.worker_bench [--corpus DIR] [--frames 300] [--workers 2] [--ocr-busy-ms 5]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+
+from autoappraiser.tools.corpus import load_corpus, synthetic_corpus
+from autoappraiser.utils.ocr_engines import FakeOcrEngine
+from autoappraiser.utils.ocr_handler import OcrHandler
+from autoappraiser.utils.ocr_service import OcrService
+from autoappraiser.utils.process_ocr import ProcessOcr
+from autoappraiser.utils.text_filter import TextFilter
+from autoappraiser.utils.text_roi import TextRoi
+
+
+class Ticker:
+    """Thread that wakes every ``period`` seconds and records how late each wake-up was."""
+
+    def __init__(self, period):
+        self.period = period
+        self.late_ms = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ticker", daemon=True)
+
+    def _run(self):
+        target = time.perf_counter()
+        while not self._stop.is_set():
+            target += self.period
+            delay = target - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.late_ms.append(max(0.0, time.perf_counter() - target) * 1000)
+            # Don't try to catch up on ticks missed while starved
+            target = max(target, time.perf_counter() - self.period)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def summarise(samples):
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {'p50_ms': cuts[49], 'p99_ms': cuts[98], 'max_ms': max(samples), 'mean_ms': statistics.fmean(samples)}
+
+
+def in_thread_reader(engine_kwargs):
+    handler = OcrHandler()
+    handler.text_filter = TextFilter()
+    handler.text_filter.lut
+    roi = TextRoi()
+    engine = FakeOcrEngine(**engine_kwargs)
+    service = OcrService().start()
+
+    def read(frame):
+        mask = handler.text_filter.mask(frame)
+        crop = roi.crop(mask, roi.locate(mask))
+        return service.run(handler.recognize_array(engine, crop))
+
+    return read, service.stop
+
+
+def process_reader(engine_kwargs, workers, slot_bytes):
+    workers = ProcessOcr(workers, slot_bytes=slot_bytes, engine=engine_kwargs).start()
+
+    def read(frame):
+        crop, _ = workers.prepare(frame).result(5)
+        return workers.recognize(crop).result(5)
+
+    # Let the workers finish importing before anything is timed
+    read(synthetic_corpus()[0][1])
+    return read, workers.stop
+
+
+def measure(read, frames, count, tick):
+    latencies = []
+    with Ticker(tick) as ticker:
+        for i in range(count):
+            start = time.perf_counter()
+            read(frames[i % len(frames)])
+            latencies.append((time.perf_counter() - start) * 1000)
+    return {'latency': summarise(latencies), 'tick_late': summarise(ticker.late_ms)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare in-thread and out-of-process filter/OCR")
+    parser.add_argument("--corpus", help="directory of recorded capture-box frames (default: synthetic)")
+    parser.add_argument("--frames", type=int, default=300, help="frames read per mode")
+    parser.add_argument("--workers", type=int, default=2, help="worker processes")
+    parser.add_argument("--ocr-busy-ms", type=float, default=5.0, help="GIL-holding work per fake OCR call")
+    parser.add_argument("--ocr-delay-ms", type=float, default=0.0, help="idle wait per fake OCR call")
+    parser.add_argument("--tick-ms", type=float, default=5.0, help="period of the stand-in GUI ticker")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    frames = [frame for _, frame, _ in corpus]
+    engine_kwargs = {'text': "", 'busy': args.ocr_busy_ms / 1000, 'delay': args.ocr_delay_ms / 1000}
+    slot_bytes = max(frame.nbytes for frame in frames)
+    tick = args.tick_ms / 1000
+
+    results = {}
+    with Ticker(tick) as idle:
+        time.sleep(1)
+    results['idle'] = {'tick_late': summarise(idle.late_ms)}
+    for name, make in (
+        ("in-thread", lambda: in_thread_reader(engine_kwargs)),
+        ("processes", lambda: process_reader(engine_kwargs, args.workers, slot_bytes)),
+    ):
+        read, close = make()
+        try:
+            results[name] = measure(read, frames, args.frames, tick)
+        finally:
+            close()
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return
+    print(f"{'mode':<12}{'latency p50':>13}{'p99':>9}{'max':>9}{'tick late p50':>16}{'p99':>9}{'max':>9}  (ms)")
+    for name, r in results.items():
+        lat = r.get('latency')
+        lat_text = f"{lat['p50_ms']:>13.2f}{lat['p99_ms']:>9.2f}{lat['max_ms']:>9.2f}" if lat else f"{'-':>13}{'-':>9}{'-':>9}"
+        late = r['tick_late']
+        print(f"{name:<12}{lat_text}{late['p50_ms']:>16.2f}{late['p99_ms']:>9.2f}{late['max_ms']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
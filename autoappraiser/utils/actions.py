@@ -1,46 +1,84 @@
 import time
-import keyboard as kb
-import pydirectinput
+
+from .button_matcher import wait_for_button
+from .scheduler import call, click, key, move, wait
+
+# Pause between the two clicks of a pair
+DOUBLE_CLICK_GAP = 0.2
+# Pixels searched around the gamepass boxes, so a button that shifted a little still matches
+GP_SEARCH_MARGIN = 16
 
 class Actions:
-    def do_totem(self, anchor_pos):
-        if self.last_totem is None or (self.last_totem and (time.time() - self.last_totem > self.totem_interval * 60)):
-            # move mouse up slightly
-            pydirectinput.moveTo(anchor_pos[0], anchor_pos[1] - 200)
-            time.sleep(0.5)
-            kb.press_and_release(str(self.totem_slot)) # Ensure string for keyboard
-            time.sleep(0.3)
-            pydirectinput.click()
-            self.last_totem = time.time()
-            time.sleep(1)
-            pydirectinput.moveTo(anchor_pos[0], anchor_pos[1])
-            time.sleep(1)
-            kb.press_and_release(str(self.fish_slot)) # Ensure string for keyboard
-            time.sleep(0.5)
-
-    def appraise_normal(self):
-        if self.mouse_position is None:
-            self.mouse_position = pydirectinput.position()
-
-        anchor_pos = self.mouse_position
-        pydirectinput.moveTo(anchor_pos[0], anchor_pos[1])
-        pydirectinput.click()
-        time.sleep(0.2)
-        pydirectinput.moveTo(anchor_pos[0], anchor_pos[1])
-        pydirectinput.click()
-        time.sleep(self.loop_interval / 1000)
-        pydirectinput.moveTo(anchor_pos[0], anchor_pos[1])
-        pydirectinput.click()
-        time.sleep(0.2)
-        pydirectinput.moveTo(anchor_pos[0], anchor_pos[1])
-        pydirectinput.click()
-        time.sleep(self.loop_interval / 1000)
-
-    def appraise_gp(self):
-        # 1. select fish
-        # 2. press `
-        # 3. move mouse to gp box
-        # 4. click
-        # 5. move mouse to gp confirm box
-        # 6. click
-        pass
+    def do_totem(self, lane, token=None):
+        """Use the totem in ``lane`` and switch back to the fish; when to call it is up to its ``totem_planner``."""
+        anchor_pos = lane.anchor
+        with self.metrics.span("totem"):
+            self.scheduler.run([
+                # move mouse up slightly
+                move(anchor_pos[0], anchor_pos[1] - 200),
+                wait(0.5),
+                key(self.totem_slot),
+                wait(0.3),
+                click(),
+                call(lane.totem_planner.used),
+                wait(1),
+                move(anchor_pos[0], anchor_pos[1]),
+                wait(1),
+                key(self.fish_slot),
+                wait(0.5),
+            ], token)
+
+    def _mark_click(self, lane):
+        lane.last_click = time.monotonic()
+
+    def _click_twice(self, lane):
+        anchor_pos = lane.anchor
+        return [
+            move(anchor_pos[0], anchor_pos[1]),
+            click(),
+            wait(DOUBLE_CLICK_GAP),
+            move(anchor_pos[0], anchor_pos[1]),
+            click(),
+            call(self._mark_click, lane),
+        ]
+
+    def appraise_normal(self, lane, token=None):
+        if lane.anchor is None:
+            lane.anchor = self.scheduler.backend.position()
+
+        interval = lane.loop_timer.interval
+        steps = self._click_twice(lane) + [wait(interval)]
+        if self.text_trigger:
+            # Only watch for what the second pair of clicks brings up; the
+            # trigger's wait replaces the fixed sleep after it
+            steps += [call(lane.trigger.arm)] + self._click_twice(lane)
+        else:
+            steps += self._click_twice(lane) + [wait(interval)]
+        self.scheduler.run(steps, token)
+
+    def appraise_gp(self, lane, token=None):
+        """
+        Gamepass appraisal: open the menu, then click the gamepass and confirm
+        buttons as soon as each one is matched inside its box. Returns False
+        when a button doesn't show up within ``gp_timeout`` ms.
+        """
+        # The fish is already in hand (do_totem switches back to it)
+        self.scheduler.run([key(self.gp_menu_key)], token)
+
+        buttons = ((self.gp_box, self.gp_template), (self.gp_confirm_box, self.gp_confirm_template))
+        for index, (box, template) in enumerate(buttons):
+            pos = wait_for_button(
+                lambda box=box: self.grab_box(box, GP_SEARCH_MARGIN), self.frame_pixels,
+                template, self.gp_timeout / 1000, token=token,
+            )
+            if pos is None:
+                print(f"Gamepass button not found: {template.path}")
+                self.metrics.error("gp_button_missing")
+                return False
+
+            steps = [move(pos[0], pos[1]), click(), call(self._mark_click, lane)]
+            if index == len(buttons) - 1 and self.text_trigger:
+                # The confirm click brings up the text
+                steps.insert(0, call(lane.trigger.arm))
+            self.scheduler.run(steps, token)
+        return True
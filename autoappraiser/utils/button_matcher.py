@@ -0,0 +1,83 @@
+import os
+import time
+
+import cv2
+import numpy as np
+
+from .cancel import CancelToken
+
+
+def to_gray(img, is_bgra=False):
+    if img.ndim == 2:
+        return img
+    return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY if is_bgra else cv2.COLOR_RGB2GRAY)
+
+
+class ButtonTemplate:
+    """
+    Grayscale snapshot of an on-screen button, found again with normalised
+    cross-correlation.
+
+    The template is the content of its overlay box at the time it was saved;
+    grabs for ``find`` cover the box plus a margin, so the button may move a
+    few pixels and still match.
+    """
+
+    def __init__(self, path, threshold=0.8):
+        self.path = path
+        self.threshold = threshold
+        self.image = None
+        self.load()
+
+    @property
+    def ready(self):
+        return self.image is not None
+
+    def load(self):
+        self.image = None
+        if self.path and os.path.exists(self.path):
+            self.image = cv2.imread(self.path, cv2.IMREAD_GRAYSCALE)
+
+    def save(self, img, is_bgra=False):
+        gray = np.ascontiguousarray(to_gray(img, is_bgra))
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        if not cv2.imwrite(self.path, gray):
+            raise OSError(f"Could not write {self.path}")
+        self.image = gray
+
+    def find(self, img, is_bgra=False):
+        """``(score, (x, y))`` of the best match centre in ``img``, or None below the threshold."""
+        if self.image is None:
+            return None
+        gray = to_gray(img, is_bgra)
+        th, tw = self.image.shape
+        if gray.shape[0] < th or gray.shape[1] < tw:
+            return None
+        scores = cv2.matchTemplate(gray, self.image, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (x, y) = cv2.minMaxLoc(scores)
+        if score < self.threshold:
+            return None
+        return score, (x + tw // 2, y + th // 2)
+
+
+def wait_for_button(grab, to_pixels, template, timeout, poll_interval=0.01, token=None):
+    """
+    Poll ``grab()`` until ``template`` shows up; return its centre in screen
+    coordinates, or None after ``timeout`` seconds.
+    """
+    token = token if token is not None else CancelToken()
+    deadline = time.monotonic() + timeout
+    while True:
+        frame = grab()
+        if frame is not None:
+            img, is_bgra = to_pixels(frame)
+            found = template.find(img, is_bgra)
+            if found is not None:
+                left, top = frame.region[:2]
+                x, y = found[1]
+                return left + x, top + y
+        if time.monotonic() >= deadline:
+            return None
+        token.sleep(poll_interval)
@@ -1,27 +1,56 @@
-import dxcam_cpp as dxcam
-import mss
-import winrt.windows.graphics.imaging as imaging
-import winrt.windows.storage.streams as streams
+from .capture_backends import BACKENDS, create_backend, select_backend
 
 class Camera:
-    def switch_camera(self):
-        if self.capture_mode == "DXCAM":
-            self.camera = dxcam.create()
-        else:
-            self.camera = mss.mss()
+    def capture_options(self):
+        return {
+            'pool': self.frame_pool,
+            'stream': self.use_stream,
+            'fps': self.stream_fps,
+            'replay_dir': self.replay_dir
+        }
 
-    def capture_screen(self):
-        if self.camera is None:
-            return None
+    def capture_modes(self):
+        return list(BACKENDS) + ["AUTO"]
+
+    def switch_camera(self, capture_mode=None):
+        # Startup warm-up and the Settings tab can both get here
+        with self.camera_lock:
+            if capture_mode is not None:
+                self.capture_mode = capture_mode
+
+            if getattr(self, 'camera', None) is not None:
+                self.camera.close()
+            self.camera = None
+
+            options = self.capture_options()
+            backend = self.capture_mode
+            if backend == "AUTO":
+                # Probe grab latency of every available backend and keep the fastest
+                backend = select_backend(self.capture_region(), **options)
+
+            try:
+                self.camera = create_backend(backend, **options)
+                self.capture_backend = backend
+            except Exception as e:
+                print(f"Failed to start {backend} capture: {e}")
+                self.capture_backend = None
 
-        # Get screen dimensions from tkinter or safe default (dxcam usually targets primary)
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
+    def update_screen_size(self):
+        # tkinter calls must stay on the GUI thread; capture threads read the cached value
+        self.screen_size = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
 
-        x = int(self.capture_box.capture_x)
-        y = int(self.capture_box.capture_y)
-        w = int(self.capture_box.capture_width)
-        h = int(self.capture_box.capture_height)
+    def capture_region(self):
+        """Capture box clipped to the screen as (left, top, right, bottom), or None."""
+        return self.box_region(self.capture_box)
+
+    def box_region(self, box, margin=0):
+        """``box`` grown by ``margin`` pixels and clipped to the screen as (left, top, right, bottom), or None."""
+        screen_width, screen_height = self.screen_size
+
+        x = int(box.capture_x) - margin
+        y = int(box.capture_y) - margin
+        w = int(box.capture_width) + 2 * margin
+        h = int(box.capture_height) + 2 * margin
 
         # dxcam expects (left, top, right, bottom)
         left = max(0, x)
@@ -32,25 +61,42 @@ class Camera:
         # Ensure valid region
         if right <= left or bottom <= top:
             return None
+        return (left, top, right, bottom)
+
+    def capture_screen(self, after=None, timeout=0.1, box=None):
+        """
+        Grab the capture box, or another lane's ``box``. Streaming backends
+        return the newest frame, or with ``after`` the first frame captured
+        after that monotonic timestamp.
+        """
+        if self.camera is None:
+            return None
+
+        box = self.capture_box if box is None else box
+        region = self.box_region(box)
+        if region is None:
+            return None
+
+        try:
+            if box is not self.capture_box:
+                # Only the main capture box streams; other lanes' boxes would restart it
+                return self.camera.grab_region(region)
+            return self.camera.grab(region, after=after, timeout=timeout)
+        except Exception as e:
+            print(f"Capture error: {e}")
+            return None
+
+    def grab_box(self, box, margin=0):
+        """Grab one of the overlay boxes (plus ``margin``) for button detection."""
+        if self.camera is None:
+            return None
+
+        region = self.box_region(box, margin)
+        if region is None:
+            return None
 
         try:
-            if self.capture_mode == "DXCAM":
-                frame = self.camera.grab(region=(left, top, right, bottom))
-            elif self.capture_mode == "MSS":
-                sct_img = self.camera.grab({"top": top, "left": left, "width": w, "height": h})
-                
-                # Create IBuffer from bytes via DataWriter
-                data_writer = streams.DataWriter()
-                data_writer.write_bytes(sct_img.raw)
-                ibuffer = data_writer.detach_buffer()
-
-                frame = imaging.SoftwareBitmap.create_copy_from_buffer(
-                    ibuffer,
-                    imaging.BitmapPixelFormat.BGRA8,
-                    int(sct_img.width),
-                    int(sct_img.height)
-                )
-            return frame
+            return self.camera.grab_region(region)
         except Exception as e:
             print(f"Capture error: {e}")
             return None
@@ -0,0 +1,79 @@
+import concurrent.futures
+import threading
+
+
+class Cancelled(Exception):
+    """Raised out of a wait when its ``CancelToken`` was cancelled."""
+
+
+class CancelToken:
+    """
+    One-shot cancellation flag shared by everything one appraisal run waits on.
+
+    Waits go through the token (``sleep``, ``result``) or register a callback
+    that wakes them, so ``cancel`` interrupts them at once instead of when the
+    current sleep runs out.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn()
+            except Exception as e:
+                print(f"Cancel callback failed: {e}")
+
+    def add_callback(self, fn):
+        """Call ``fn`` on cancel (right away if already cancelled); returns ``fn`` for ``remove_callback``."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(fn)
+                return fn
+        fn()
+        return fn
+
+    def remove_callback(self, fn):
+        with self._lock:
+            if fn in self._callbacks:
+                self._callbacks.remove(fn)
+
+    def check(self):
+        if self._event.is_set():
+            raise Cancelled()
+
+    def wait(self, timeout=None):
+        """Wait up to ``timeout`` seconds; True if cancelled."""
+        return self._event.wait(timeout)
+
+    def sleep(self, seconds):
+        """``time.sleep`` that raises ``Cancelled`` as soon as the token is cancelled."""
+        if seconds > 0 and self._event.wait(seconds):
+            raise Cancelled()
+        self.check()
+
+    def result(self, future, timeout=None):
+        """``future.result(timeout)`` that raises ``Cancelled`` instead of waiting on after a cancel."""
+        done = threading.Event()
+        future.add_done_callback(lambda _: done.set())
+        callback = self.add_callback(done.set)
+        try:
+            done.wait(timeout)
+        finally:
+            self.remove_callback(callback)
+        self.check()
+        if not future.done():
+            raise concurrent.futures.TimeoutError()
+        return future.result()
@@ -0,0 +1,225 @@
+import itertools
+import os
+import statistics
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from .frame import Frame
+from .frame_stream import DxcamStream
+
+BACKENDS = {}
+IMAGE_EXTENSIONS = (".png", ".bmp", ".jpg", ".jpeg", ".npy")
+
+
+def register_backend(cls):
+    """Class decorator adding a capture backend to the registry under ``cls.name``."""
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+def load_frame_file(path):
+    """Load a recorded frame as an RGB numpy array (same layout DXCAM returns)."""
+    if path.endswith(".npy"):
+        return np.load(path)
+    img = cv2.imread(path, cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError(f"Unreadable frame: {path}")
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+
+class CaptureBackend:
+    """
+    Common interface for screen capture backends.
+
+    ``grab`` returns a ``Frame`` of the (left, top, right, bottom) region or
+    None. Backends that keep capturing in the background honour ``after``
+    (a monotonic timestamp the frame must be newer than); others ignore it.
+    Heavy third-party modules are imported in ``__init__`` so only the backend
+    in use gets loaded.
+    """
+    name = None
+    # Whether the backend reads the real screen (replay doesn't, so AUTO skips it)
+    live = True
+
+    @classmethod
+    def available(cls, **options):
+        return True
+
+    def grab(self, region, after=None, timeout=0.1):
+        raise NotImplementedError
+
+    def grab_region(self, region):
+        """One-off grab of any screen region (e.g. a button), not the capture box."""
+        return self.grab(region)
+
+    def close(self):
+        pass
+
+
+@register_backend
+class DxcamBackend(CaptureBackend):
+    name = "DXCAM"
+
+    @classmethod
+    def available(cls, **options):
+        try:
+            import dxcam_cpp  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def __init__(self, pool=None, stream=False, fps=60, **options):
+        import dxcam_cpp as dxcam
+        self.camera = dxcam.create()
+        self.stream = DxcamStream(self.camera, pool, fps=fps) if stream and pool is not None else None
+        self._side = None
+
+    def grab(self, region, after=None, timeout=0.1):
+        if self.stream is not None:
+            self.stream.ensure(region)
+            if after is None:
+                return self.stream.latest() or self.stream.wait_after(0, timeout)
+            return self.stream.wait_after(after, timeout)
+
+        # dxcam returns a fresh RGB array, or None when nothing changed
+        pixels = self.camera.grab(region=region)
+        if pixels is None:
+            return None
+        return Frame(pixels, is_bgra=False, region=region)
+
+    def grab_region(self, region):
+        if self.stream is None:
+            frame = self.grab(region)
+            if frame is not None:
+                return frame
+        # dxcam has nothing for a screen that hasn't changed since its last grab, and
+        # a grab of another region would restart the stream; use MSS on the side
+        if self._side is None:
+            if not MssBackend.available():
+                return None
+            self._side = MssBackend()
+        return self._side.grab(region)
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop()
+        if self._side is not None:
+            self._side.close()
+
+
+@register_backend
+class MssBackend(CaptureBackend):
+    name = "MSS"
+
+    @classmethod
+    def available(cls, **options):
+        try:
+            import mss  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def __init__(self, **options):
+        import mss
+        self.sct = mss.mss()
+
+    def grab(self, region, after=None, timeout=0.1):
+        left, top, right, bottom = region
+        sct_img = self.sct.grab({"top": top, "left": left, "width": right - left, "height": bottom - top})
+        # View mss' BGRA bytes in place instead of copying them into a SoftwareBitmap
+        return Frame.from_buffer(sct_img.raw, int(sct_img.width), int(sct_img.height), region=region)
+
+    def close(self):
+        self.sct.close()
+
+
+@register_backend
+class ReplayBackend(CaptureBackend):
+    """
+    Plays back recorded capture-box frames from a directory (or a list of
+    arrays) in a loop, ignoring the requested region. Works on any platform.
+    """
+    name = "REPLAY"
+    live = False
+
+    @classmethod
+    def available(cls, replay_dir=None, frames=None, **options):
+        return bool(frames) or bool(replay_dir and os.path.isdir(replay_dir))
+
+    def __init__(self, replay_dir=None, frames=None, replay_fps=0, **options):
+        if frames is None:
+            if not replay_dir or not os.path.isdir(replay_dir):
+                raise ValueError(f"Replay directory not found: {replay_dir}")
+            names = sorted(n for n in os.listdir(replay_dir) if n.lower().endswith(IMAGE_EXTENSIONS))
+            frames = [load_frame_file(os.path.join(replay_dir, n)) for n in names]
+        if not frames:
+            raise ValueError("Replay backend has no frames")
+        self.frames = frames
+        self.interval = 1 / replay_fps if replay_fps else 0
+        self._cycle = itertools.cycle(frames)
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def grab(self, region, after=None, timeout=0.1):
+        with self._lock:
+            if self.interval:
+                # Pace playback like a real screen refreshing at replay_fps
+                delay = self._next_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                self._next_at = time.monotonic() + self.interval
+            pixels = next(self._cycle)
+        return Frame(pixels, is_bgra=pixels.ndim == 3 and pixels.shape[2] == 4, region=region)
+
+
+def create_backend(name, **options):
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown capture backend: {name}")
+    return backend(**options)
+
+
+def probe_backends(region, samples=20, warmup=3, **options):
+    """
+    Time ``samples`` grabs of ``region`` on every available live backend.
+
+    Returns ``(name, ms_per_frame)`` sorted fastest first, where grabs that
+    return None count as time spent without a frame.
+    """
+    results = []
+    for name, cls in BACKENDS.items():
+        if not cls.live or not cls.available(**options):
+            continue
+        backend = None
+        try:
+            backend = cls(**dict(options, stream=False))
+            for _ in range(warmup):
+                backend.grab(region)
+            got = 0
+            times = []
+            for _ in range(samples):
+                start = time.perf_counter()
+                frame = backend.grab(region)
+                times.append(time.perf_counter() - start)
+                got += frame is not None
+            if got:
+                results.append((name, statistics.fmean(times) * samples / got * 1000))
+        except Exception as e:
+            print(f"Capture probe failed for {name}: {e}")
+        finally:
+            if backend is not None:
+                backend.close()
+    return sorted(results, key=lambda r: r[1])
+
+
+def select_backend(region, fallback="MSS", **options):
+    """Name of the fastest live backend for ``region``, or ``fallback`` if none work."""
+    if region is None:
+        return fallback
+    results = probe_backends(region, **options)
+    for name, ms in results:
+        print(f"Capture probe: {name} {ms:.2f} ms/frame")
+    return results[0][0] if results else fallback
@@ -1,6 +1,6 @@
+import copy
 import os
 import sys
-import tomlkit
 import tomllib
 
 class Config:
@@ -10,7 +10,15 @@ class Config:
             'auto_totem': False,
             'fish_slot': 9,
             'totem_slot': 8,
-            'totem_interval': 2
+            'totem_interval': 2,
+            'text_trigger': True,
+            'text_max_wait_ms': 800,
+            # Shrink loop_interval toward the measured click-to-text latency
+            'adaptive_timing': True,
+            # How long after Stop the worker may still be running before it is reported
+            'stop_timeout_ms': 50,
+            # Append-only JSONL record of every appraisal, e.g. 'appraisals.jsonl' ('' = off)
+            'session_log': ''
         },
         'gp': {
             'enabled': False,
@@ -21,7 +29,14 @@ class Config:
             'confirm_width': 85,
             'confirm_height': 50,
             'confirm_x': 544,
-            'confirm_y': 576
+            'confirm_y': 576,
+            # Key that opens the gamepass appraise menu
+            'menu_key': '`',
+            # Grayscale snapshots of the two buttons, saved from the Settings tab
+            'button_template': 'templates/gp_button.png',
+            'confirm_template': 'templates/gp_confirm.png',
+            'match_threshold': 0.8,
+            'detect_timeout_ms': 2000
         },
         'hotkeys': {
             'test_capture': 'F2',
@@ -43,8 +58,35 @@ class Config:
             'capture_width': 326,
             'capture_height': 98,
             'capture_x': 639,
-            'capture_y': 517
-        }
+            'capture_y': 517,
+            'timeout_ms': 3000,
+            'cache_size': 256,
+            # Keeps cached OCR results between sessions, e.g. 'ocr_cache.json' ('' = memory only)
+            'cache_file': '',
+            # OpenCV HSV bounds of text colours: [h_lo, s_lo, v_lo, h_hi, s_hi, v_hi]
+            'color_ranges': [[35, 40, 40, 85, 255, 255]],
+            'stream': False,
+            'stream_fps': 60,
+            # Folder of recorded frames for the REPLAY capture mode
+            'replay_dir': '',
+            # Crop OCR input to the text line and scale it to text_height pixels
+            'roi': True,
+            'text_height': 32,
+            # Keeps the templates of known names (matched before OCR) between sessions,
+            # e.g. 'text_templates.npz' ('' = learned afresh each session)
+            'template_file': '',
+            'template_min_score': 0.92,
+            # Filter and OCR in this many worker processes (0 = in the app's own threads)
+            'workers': 0
+        },
+        'metrics': {
+            # JSONL file that gets a stats snapshot every interval_s seconds ('' = off)
+            'file': '',
+            'interval_s': 60
+        },
+        # Extra game clients as [[lanes]] tables: name, capture_x/y/width/height,
+        # anchor_x/y (where to click) and optionally keep = [mutations]
+        'lanes': []
     }
     NEW_MUTATIONS = [
         "Boreal",
@@ -55,16 +97,23 @@ class Config:
     def save_settings(self, filepath="config.toml"):
         try:
             self.loop_interval = int(self.loop_entry.get())
+            self.adaptive_timing = self.adaptive_timing_var.get()
+            for lane in self.lanes:
+                lane.loop_timer.set_ceiling(self.loop_interval / 1000)
+                lane.loop_timer.enabled = self.adaptive_timing
 
             self.use_gp = self.use_gp_var.get()
+            self.text_trigger = self.text_trigger_var.get()
             
             self.auto_totem = self.auto_totem_var.get()
             self.fish_slot = int(self.slot_entry.get())
             self.totem_slot = int(self.totem_slot_entry.get())
             self.totem_interval = int(self.totem_entry.get())
-            if self.capture_mode != self.capture_mode_var.get():
-                self.switch_camera()
-            self.capture_mode = self.capture_mode_var.get()
+            for lane in self.lanes:
+                lane.totem_planner.interval = self.totem_interval * 60
+            if self.capture_mode != self.capture_mode_var.get() or self.use_stream != self.stream_var.get():
+                self.use_stream = self.stream_var.get()
+                self.switch_camera(self.capture_mode_var.get())
 
             self.save_config(filepath)
         except ValueError:
@@ -77,7 +126,19 @@ class Config:
                 'capture_width': self.capture_box.capture_width,
                 'capture_height': self.capture_box.capture_height,
                 'capture_x': self.capture_box.capture_x,
-                'capture_y': self.capture_box.capture_y
+                'capture_y': self.capture_box.capture_y,
+                'timeout_ms': self.ocr_timeout,
+                'cache_size': self.ocr_cache.capacity,
+                'cache_file': self.ocr_cache.path or '',
+                'color_ranges': [list(lo) + list(hi) for lo, hi in self.text_filter.ranges],
+                'stream': self.use_stream,
+                'stream_fps': self.stream_fps,
+                'replay_dir': self.replay_dir,
+                'roi': self.use_roi,
+                'text_height': self.text_roi.text_height,
+                'template_file': self.text_templates.path or '',
+                'template_min_score': self.text_templates.min_score,
+                'workers': self.ocr_workers
             },
             'gp': {
                 'enabled': self.use_gp,
@@ -88,18 +149,33 @@ class Config:
                 'confirm_width': self.gp_confirm_box.capture_width,
                 'confirm_height': self.gp_confirm_box.capture_height,
                 'confirm_x': self.gp_confirm_box.capture_x,
-                'confirm_y': self.gp_confirm_box.capture_y
+                'confirm_y': self.gp_confirm_box.capture_y,
+                'menu_key': self.gp_menu_key,
+                'button_template': self.gp_template.path,
+                'confirm_template': self.gp_confirm_template.path,
+                'match_threshold': self.gp_template.threshold,
+                'detect_timeout_ms': self.gp_timeout
             },
             'appraise': {
                 'loop_interval': self.loop_interval,
                 'auto_totem': self.auto_totem,
                 'fish_slot': self.fish_slot,
                 'totem_slot': self.totem_slot,
-                'totem_interval': self.totem_interval
+                'totem_interval': self.totem_interval,
+                'text_trigger': self.text_trigger,
+                'text_max_wait_ms': self.text_max_wait,
+                'adaptive_timing': self.adaptive_timing,
+                'stop_timeout_ms': self.stop_timeout,
+                'session_log': self.session_log.path or ''
             },
             'mutations': {
                 'lists': self.lists
             },
+            'metrics': {
+                'file': self.metrics_file,
+                'interval_s': self.metrics_interval
+            },
+            'lanes': [lane.to_config() for lane in self.lanes[1:]],
             'hotkeys': {
                 'test_capture': self.hk_test,
                 'toggle_box': self.hk_box,
@@ -107,13 +183,24 @@ class Config:
                 'exit_app': self.hk_exit
             }
         }
+        # Only needed for writing, so it stays off the startup path
+        import tomlkit
         with open(filepath, "w") as f:
             tomlkit.dump(cfg_data, f)
 
+    def _fill_defaults(self, cfg, defaults):
+        # Older config files miss keys added since they were written
+        for key, value in defaults.items():
+            if key not in cfg:
+                cfg[key] = copy.deepcopy(value)
+            elif isinstance(value, dict) and isinstance(cfg[key], dict):
+                self._fill_defaults(cfg[key], value)
+
     def load_config(self, filepath="config.toml"):
         if os.path.exists(filepath):
             with open(filepath, "rb") as f:
                 cfg = tomllib.load(f)
+                self._fill_defaults(cfg, self.DEFAULT_CONFIG)
                 for mutation in self.NEW_MUTATIONS:
                     if mutation not in cfg['mutations']['lists']:
                         cfg['mutations']['lists'].append(mutation)
@@ -121,6 +208,7 @@ class Config:
         else:
             # Create config file if not exists
             try:
+                import tomlkit
                 with open(filepath, "w") as f:
                     for mutation in self.NEW_MUTATIONS:
                         if mutation not in self.DEFAULT_CONFIG['mutations']['lists']:
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import numpy as np
+
+
+class BufferPool:
+    """
+    Free-lists of reusable uint8 pixel buffers keyed by shape.
+
+    ``acquire`` hands out a released buffer of the right shape when one is
+    available and only allocates otherwise; ``release`` returns it. At most
+    ``per_shape`` idle buffers are kept for each shape.
+    """
+
+    def __init__(self, per_shape=8):
+        self.per_shape = per_shape
+        self.allocated = 0
+        self._free = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, shape):
+        shape = tuple(shape)
+        with self._lock:
+            free = self._free.get(shape)
+            if free:
+                return free.pop()
+            self.allocated += 1
+        return np.empty(shape, dtype=np.uint8)
+
+    def release(self, buf):
+        with self._lock:
+            free = self._free.setdefault(buf.shape, [])
+            if len(free) < self.per_shape:
+                free.append(buf)
+
+
+class Frame:
+    """
+    One captured image, exposed as a numpy view of its pixels.
+
+    Backends wrap the memory they already own (no copies); ``pool`` is set when
+    the pixels live in a ``BufferPool`` buffer. Pooled frames are reference
+    counted: whoever is handed one (a ``FrameRing`` hands the same frame to
+    every reader) ``release``-s it when done, and the last release gives the
+    buffer back to the pool.
+    """
+    __slots__ = ('pixels', 'is_bgra', 'timestamp', 'region', 'pool', 'refs')
+
+    _refs_lock = threading.Lock()
+
+    def __init__(self, pixels, is_bgra=False, timestamp=None, region=None, pool=None):
+        self.pixels = pixels
+        self.is_bgra = is_bgra
+        self.timestamp = time.monotonic() if timestamp is None else timestamp
+        self.region = region
+        self.pool = pool
+        self.refs = 1
+
+    @classmethod
+    def from_buffer(cls, data, width, height, channels=4, is_bgra=True, **kwargs):
+        """Zero-copy view over a raw bytes-like pixel buffer (e.g. mss ``raw``)."""
+        pixels = np.frombuffer(data, dtype=np.uint8).reshape((height, width, channels))
+        return cls(pixels, is_bgra=is_bgra, **kwargs)
+
+    @property
+    def width(self):
+        return self.pixels.shape[1]
+
+    @property
+    def height(self):
+        return self.pixels.shape[0]
+
+    def copy(self, pool):
+        """Copy into a pooled buffer, for consumers that outlive the backend's memory."""
+        buf = pool.acquire(self.pixels.shape)
+        np.copyto(buf, self.pixels)
+        return Frame(buf, self.is_bgra, self.timestamp, self.region, pool)
+
+    def retain(self):
+        """Take another reference for a second holder; returns the frame."""
+        with Frame._refs_lock:
+            self.refs += 1
+        return self
+
+    def release(self):
+        with Frame._refs_lock:
+            # A release with no reference left is a caller bug; refs must never go negative
+            assert self.refs > 0, "Frame released more times than it was retained"
+            if self.refs <= 0:
+                return
+            self.refs -= 1
+            if self.refs > 0:
+                return
+            pool, pixels = self.pool, self.pixels
+            self.pool = None
+        if pool is not None and pixels is not None:
+            pool.release(pixels)
+        self.pixels = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def release(frame):
+    """``frame.release()`` for captured frames; bare arrays and None need nothing."""
+    if isinstance(frame, Frame):
+        frame.release()
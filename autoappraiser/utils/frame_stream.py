@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import deque
+
+from .frame import Frame
+
+
+class FrameRing:
+    """
+    Small ring of the most recent timestamped frames.
+
+    The ring holds one reference to each frame and every reader gets its own
+    (``Frame.retain``), so a frame's buffer goes back to its pool once it has
+    fallen off the end and every reader has released it.
+    """
+
+    def __init__(self, size=4):
+        self._entries = deque(maxlen=size)
+        self._cond = threading.Condition()
+
+    def push(self, frame):
+        with self._cond:
+            if len(self._entries) == self._entries.maxlen:
+                self._entries[0].release()
+            self._entries.append(frame)
+            self._cond.notify_all()
+
+    def latest(self):
+        with self._cond:
+            return self._entries[-1].retain() if self._entries else None
+
+    def wait_after(self, timestamp, timeout=None):
+        """First frame captured after ``timestamp``, waiting up to ``timeout`` seconds for it."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                for frame in self._entries:
+                    if frame.timestamp > timestamp:
+                        return frame.retain()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def clear(self):
+        with self._cond:
+            for frame in self._entries:
+                frame.release()
+            self._entries.clear()
+
+
+class DxcamStream:
+    """
+    Continuous DXCAM capture of one region into a ``FrameRing``.
+
+    ``ensure`` (re)starts the camera whenever the requested region differs
+    from the running one, so moving the capture box restarts the stream.
+    """
+
+    def __init__(self, camera, pool, fps=60, size=4):
+        self.camera = camera
+        self.pool = pool
+        self.fps = fps
+        self.ring = FrameRing(size)
+        self.region = None
+        self._thread = None
+        self._running = threading.Event()
+        self._lock = threading.Lock()
+
+    def ensure(self, region):
+        with self._lock:
+            if region == self.region and self._running.is_set():
+                return
+            self._stop()
+            self.region = region
+            self.ring.clear()
+            self.camera.start(region=region, target_fps=self.fps, video_mode=True)
+            self._running.set()
+            self._thread = threading.Thread(target=self._pump, name="dxcam-stream", daemon=True)
+            self._thread.start()
+
+    def _pump(self):
+        region = self.region
+        while self._running.is_set():
+            pixels = self.camera.get_latest_frame()
+            if pixels is None or not self._running.is_set():
+                continue
+            # dxcam reuses its own ring buffer, so keep a pooled copy
+            self.ring.push(Frame(pixels, is_bgra=False, region=region).copy(self.pool))
+
+    def latest(self):
+        return self.ring.latest()
+
+    def wait_after(self, timestamp, timeout=None):
+        return self.ring.wait_after(timestamp, timeout)
+
+    def _stop(self):
+        if not self._running.is_set():
+            return
+        self._running.clear()
+        try:
+            self.camera.stop()
+        except Exception as e:
+            print(f"Failed to stop capture stream: {e}")
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        self.region = None
+
+    def stop(self):
+        with self._lock:
+            self._stop()
@@ -0,0 +1,105 @@
+import threading
+import time
+
+from .matcher import MutationMatcher
+
+
+class LaneBox:
+    """Capture region of a lane that has no overlay window; has the attributes ``box_region`` reads."""
+
+    def __init__(self, capture_x, capture_y, capture_width, capture_height):
+        self.capture_x = capture_x
+        self.capture_y = capture_y
+        self.capture_width = capture_width
+        self.capture_height = capture_height
+
+
+class Lane:
+    """
+    One game client driven by the appraisal loop.
+
+    A lane has its own capture box, click anchor, text trigger, loop timing,
+    text crop tracking and totem plan; the capture backend, OCR pipeline and
+    GUI are shared. The main lane follows the mouse (its anchor is wherever
+    the cursor is when appraising starts) and keeps what the Mutations tab
+    selects; extra lanes come from ``[[lanes]]`` in the config with a fixed
+    anchor and, optionally, their own ``keep`` list.
+    """
+
+    def __init__(self, name, box, trigger, loop_timer, text_roi, totem_planner, anchor=None, keep=None):
+        self.name = name
+        self.box = box
+        self.trigger = trigger
+        self.loop_timer = loop_timer
+        self.text_roi = text_roi
+        self.totem_planner = totem_planner
+        self.follow_mouse = anchor is None
+        self.anchor = anchor
+        self.keep = keep
+        self.matcher = None
+        self.active = True
+        self.pending = None
+        self.last_click = None
+        self.next_at = 0.0
+
+    def build_matcher(self, lists):
+        """Own matcher for lanes with a ``keep`` list; others use the app's."""
+        self.matcher = MutationMatcher(lists, self.keep) if self.keep is not None else None
+
+    def reset(self):
+        """Forget per-run state when appraising (re)starts or stops."""
+        self.active = True
+        self.pending = None
+        self.next_at = 0.0
+        self.totem_planner.pause()
+        if self.follow_mouse:
+            self.anchor = None
+
+    def to_config(self):
+        cfg = {
+            'name': self.name,
+            'capture_x': self.box.capture_x,
+            'capture_y': self.box.capture_y,
+            'capture_width': self.box.capture_width,
+            'capture_height': self.box.capture_height,
+            'anchor_x': self.anchor[0],
+            'anchor_y': self.anchor[1],
+        }
+        if self.keep is not None:
+            cfg['keep'] = list(self.keep)
+        return cfg
+
+
+class LaneScheduler:
+    """
+    Earliest-due-first rotation over the active lanes.
+
+    After a lane submits its capture it is due again one loop interval
+    later (``done``). Meanwhile the worker serves whichever other lane is due
+    first, so one lane clicks while another lane's capture is in OCR.
+    """
+
+    def __init__(self, lanes=()):
+        self.lanes = list(lanes)
+        self._lock = threading.Lock()
+
+    def next(self):
+        """The active lane due first, or None when every lane has stopped."""
+        with self._lock:
+            active = [lane for lane in self.lanes if lane.active]
+        return min(active, key=lambda lane: lane.next_at) if active else None
+
+    def done(self, lane, delay):
+        lane.next_at = time.monotonic() + max(0.0, delay)
+
+    def stop(self, lane):
+        """Take ``lane`` out of the rotation; True if no lane is left."""
+        with self._lock:
+            lane.active = False
+            lane.totem_planner.pause()
+            return not any(other.active for other in self.lanes)
+
+    def reset(self):
+        with self._lock:
+            for lane in self.lanes:
+                lane.reset()
@@ -0,0 +1,77 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class LoopTimer:
+    """
+    Adaptive replacement for the fixed ``loop_interval`` waits.
+
+    Learns how long the game takes from the last click to the appraisal text
+    (``observe``) and moves ``interval`` toward the 90th percentile of that
+    latency plus a safety margin, never above the configured ``ceiling``.
+    Outcomes come in through ``result``: every failure (a stall or a capture
+    with no readable text) multiplies the interval by ``backoff``, and while
+    failures make up more than ``max_fail_rate`` of the recent outcomes the
+    margin doubles. Successes shrink the interval by ``shrink`` per cycle, so
+    it creeps down rather than jumping.
+    """
+
+    def __init__(self, ceiling, floor=0.1, margin=0.25, min_margin=0.05, window=32, min_samples=5,
+                 shrink=0.9, backoff=1.5, max_fail_rate=0.1, enabled=True):
+        self.ceiling = ceiling
+        self.floor = min(floor, ceiling)
+        self.base_margin = margin
+        self.margin = margin
+        self.min_margin = min_margin
+        self.min_samples = min_samples
+        self.shrink = shrink
+        self.backoff = backoff
+        self.max_fail_rate = max_fail_rate
+        self.enabled = enabled
+        self._interval = ceiling
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @property
+    def interval(self):
+        """Seconds to wait where the loop used to wait ``loop_interval``."""
+        return self._interval if self.enabled else self.ceiling
+
+    def set_ceiling(self, ceiling):
+        with self._lock:
+            self.ceiling = ceiling
+            self.floor = min(self.floor, ceiling)
+            self._interval = min(self._interval, ceiling)
+
+    def target(self):
+        """Where the interval is heading, or the ceiling until enough latencies were seen."""
+        if len(self._latencies) < self.min_samples:
+            return self.ceiling
+        p90 = float(np.percentile(np.array(self._latencies), 90))
+        return min(self.ceiling, max(self.floor, p90 * (1 + self.margin) + self.min_margin))
+
+    def observe(self, latency):
+        """Click-to-text latency of one appraisal, in seconds."""
+        with self._lock:
+            self._latencies.append(max(0.0, latency))
+
+    def result(self, ok):
+        """Whether an appraisal produced readable text in time."""
+        with self._lock:
+            self._outcomes.append(bool(ok))
+            fail_rate = self._outcomes.count(False) / len(self._outcomes)
+            if fail_rate > self.max_fail_rate:
+                self.margin = min(self.base_margin * 8, self.margin * 2)
+            elif fail_rate == 0:
+                self.margin = self.base_margin
+
+            target = self.target()
+            if not ok:
+                self._interval = min(self.ceiling, self._interval * self.backoff)
+            elif self._interval < target:
+                self._interval = target
+            else:
+                self._interval = max(target, self._interval * self.shrink)
@@ -0,0 +1,64 @@
+import threading
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class MaskGate:
+    """
+    Cheap pre-OCR check that a text mask can contain a line of text.
+
+    Looks at the lit-pixel count and at how many rows/columns hold any lit
+    pixel (the text's height and width). Thresholds start at fixed floors and
+    are learned from masks the OCR engine did read text from: each becomes
+    ``margin`` times a low percentile of the recent positives, so empty and
+    half-faded frames are skipped without ever calling the engine.
+    """
+
+    def __init__(self, min_lit=20, min_rows=4, min_cols=8, margin=0.5, window=64, min_samples=8):
+        self.floors = (min_lit, min_rows, min_cols)
+        self.thresholds = self.floors
+        self.margin = margin
+        self.min_samples = min_samples
+        self.passed = 0
+        self.skipped = 0
+        self._positives = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def stats(self, mask):
+        """(lit pixels, rows with text, columns with text) of a single-channel mask."""
+        lit = cv2.countNonZero(mask)
+        if not lit:
+            return 0, 0, 0
+        # Row/column projections; numpy's any() beats cv2.reduce on row-wise reductions here
+        rows = int(np.count_nonzero(mask.any(axis=1)))
+        cols = int(np.count_nonzero(mask.any(axis=0)))
+        return lit, rows, cols
+
+    def accept(self, mask):
+        """Whether OCR is worth running on ``mask``; returns (accepted, stats)."""
+        return self.accept_stats(self.stats(mask))
+
+    def accept_stats(self, stats):
+        """``accept`` for stats already taken elsewhere, e.g. in an OCR worker process."""
+        accepted = all(value >= minimum for value, minimum in zip(stats, self.thresholds))
+        with self._lock:
+            if accepted:
+                self.passed += 1
+            else:
+                self.skipped += 1
+        return accepted, stats
+
+    def learn(self, stats, text):
+        """Feed back the OCR result for a mask that passed the gate."""
+        if not text or not text.strip():
+            return
+        with self._lock:
+            self._positives.append(stats)
+            if len(self._positives) < self.min_samples:
+                return
+            low = np.percentile(np.array(self._positives), 10, axis=0)
+            self.thresholds = tuple(
+                max(floor, int(value * self.margin)) for floor, value in zip(self.floors, low)
+            )
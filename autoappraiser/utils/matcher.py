@@ -0,0 +1,90 @@
+import re
+
+_NON_ALPHA = re.compile(r"[^a-z]+")
+
+
+def _fuzzy():
+    # rapidfuzz is only loaded once some text misses the exact lookups
+    from rapidfuzz import fuzz, process
+    return fuzz, process
+
+
+def normalise(text):
+    """Lower-case and reduce to space separated letter runs."""
+    return _NON_ALPHA.sub(" ", text.lower()).strip()
+
+
+class MutationMatcher:
+    """
+    Precompiled matcher for OCR text against the mutation list.
+
+    Built once when the list changes. Exact token/phrase hits come from a hash
+    lookup; only tokens that miss fall back to rapidfuzz with a score cutoff,
+    so OCR noise no longer snaps to the nearest mutation.
+    """
+    # Workaround for "Today/Tonight have boosted chance to get Mutated fish" messages
+    EXTRA_CHOICES = ("Mutated",)
+
+    def __init__(self, choices, selected=(), token_cutoff=80, text_cutoff=60):
+        self.choices = list(choices)
+        for extra in self.EXTRA_CHOICES:
+            if extra not in self.choices:
+                self.choices.append(extra)
+        self.selected = frozenset(selected)
+        self.token_cutoff = token_cutoff
+        self.text_cutoff = text_cutoff
+
+        self._exact = {}
+        self._phrases = []
+        for choice in self.choices:
+            norm = normalise(choice)
+            if not norm:
+                continue
+            self._exact.setdefault(norm, choice)
+            if " " in norm:
+                self._phrases.append((f" {norm} ", choice))
+        self._words = [norm for norm in self._exact if " " not in norm]
+        self._normalised = list(self._exact)
+
+    def match_all(self, text):
+        """Every mutation found in ``text``, in order of appearance."""
+        return [choice for choice, _ in self.match_scored(text)]
+
+    def match_scored(self, text):
+        """``(mutation, score)`` for every mutation in ``text``; exact hits score 100."""
+        norm = normalise(text or "")
+        if not norm:
+            return []
+
+        found = {}
+        padded = f" {norm} "
+        for phrase, choice in self._phrases:
+            if phrase in padded:
+                found[choice] = 100.0
+
+        for token in norm.split():
+            choice = self._exact.get(token)
+            score = 100.0
+            if choice is None and len(token) >= 3:
+                fuzz, process = _fuzzy()
+                best = process.extractOne(token, self._words, scorer=fuzz.ratio, score_cutoff=self.token_cutoff)
+                if best:
+                    choice, score = self._exact[best[0]], best[1]
+            if choice is not None and choice not in found:
+                found[choice] = score
+
+        if not found:
+            fuzz, process = _fuzzy()
+            best = process.extractOne(norm, self._normalised, scorer=fuzz.WRatio, score_cutoff=self.text_cutoff)
+            if best:
+                found[self._exact[best[0]]] = best[1]
+        return list(found.items())
+
+    def match(self, text):
+        """Best single mutation in ``text`` or ``None``."""
+        found = self.match_all(text)
+        return found[0] if found else None
+
+    def kept(self, matches):
+        """Matches the user selected to keep."""
+        return [m for m in matches if m in self.selected]
@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+from collections import deque
+
+
+class RollingHistogram:
+    """Last ``size`` samples in a fixed ring; percentiles are worked out only when read."""
+
+    def __init__(self, size=1024):
+        self._samples = [0.0] * size
+        self._next = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self._samples[self._next] = value
+        self._next = (self._next + 1) % len(self._samples)
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def summary(self):
+        window = sorted(self._samples[:min(self.count, len(self._samples))])
+        if not window:
+            return {'count': 0}
+
+        def pct(p):
+            return window[min(len(window) - 1, int(p * len(window)))]
+
+        return {
+            'count': self.count,
+            'mean': self.total / self.count,
+            'p50': pct(0.50),
+            'p95': pct(0.95),
+            'p99': pct(0.99),
+            'max': self.max,
+        }
+
+
+class _Span:
+    __slots__ = ("metrics", "name", "into", "start")
+
+    def __init__(self, metrics, name, into=None):
+        self.metrics = metrics
+        self.name = name
+        self.into = into
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        self.metrics.record(self.name, elapsed)
+        if self.into is not None:
+            self.into[self.name] = round(elapsed * 1000, 3)
+        return False
+
+
+class Metrics:
+    """
+    Always-on timings and counters for the appraisal loop.
+
+    ``span(name)`` times a block on the monotonic clock into a rolling
+    histogram (milliseconds), ``count`` bumps a counter and ``error`` counts a
+    failure by kind. Recording is a lock plus a few list writes, so spans cost
+    about a microsecond; everything expensive happens in ``snapshot``, which the
+    GUI and the optional JSONL exporter call.
+    """
+
+    def __init__(self, window=1024, rate_window=64):
+        self.window = window
+        self.rate_window = rate_window
+        self.started = time.monotonic()
+        self._histograms = {}
+        self._counters = {}
+        self._events = {}
+        self._lock = threading.Lock()
+        self._exporter = None
+        self._stop = threading.Event()
+
+    def span(self, name, into=None):
+        """Time a ``with`` block as ``name``; the milliseconds are also stored in the ``into`` dict if given."""
+        return _Span(self, name, into)
+
+    def record(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = RollingHistogram(self.window)
+            histogram.add(seconds * 1000)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+            events = self._events.get(name)
+            if events is None:
+                events = self._events[name] = deque(maxlen=self.rate_window)
+            events.append(time.monotonic())
+
+    def error(self, kind):
+        self.count(f"error.{kind}")
+
+    def rate(self, name):
+        """Recent events per hour of counter ``name``, over its last ``rate_window`` events."""
+        with self._lock:
+            events = self._events.get(name)
+            if not events or len(events) < 2 or events[-1] == events[0]:
+                return 0.0
+            return (len(events) - 1) / (events[-1] - events[0]) * 3600
+
+    def snapshot(self):
+        with self._lock:
+            stages = {name: h.summary() for name, h in self._histograms.items()}
+            counters = dict(self._counters)
+        return {
+            'time': time.time(),
+            'uptime_s': time.monotonic() - self.started,
+            'stages_ms': stages,
+            'counters': counters,
+            'appraisals_per_hour': self.rate('appraisals'),
+        }
+
+    def format(self):
+        """Short multi-line readout for the GUI."""
+        snap = self.snapshot()
+        lines = [f"Appraisals/hour: {snap['appraisals_per_hour']:.0f}"]
+        for name, s in sorted(snap['stages_ms'].items()):
+            if s['count']:
+                lines.append(f"{name}: p50 {s['p50']:.1f} / p95 {s['p95']:.1f} / max {s['max']:.1f} ms ({s['count']})")
+        for name, value in sorted(snap['counters'].items()):
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
+
+    def start_exporter(self, path, interval=60):
+        """Append a snapshot to ``path`` as one JSON line every ``interval`` seconds."""
+        if not path or self._exporter is not None:
+            return
+        self._stop.clear()
+        self._exporter = threading.Thread(target=self._export_loop, args=(path, interval), name="metrics-export", daemon=True)
+        self._exporter.start()
+
+    def _export_loop(self, path, interval):
+        while not self._stop.wait(interval):
+            self.export(path)
+
+    def export(self, path):
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.snapshot()) + "\n")
+        except Exception as e:
+            print(f"Failed to write metrics: {e}")
+
+    def stop(self, path=None):
+        """Stop the exporter, writing one final snapshot to ``path`` if given."""
+        self._stop.set()
+        if self._exporter is not None:
+            self._exporter.join(1.0)
+            self._exporter = None
+        if path:
+            self.export(path)
@@ -2,10 +2,6 @@ import time
 import customtkinter as ctk
 import sys
 import os
-import winrt.windows.graphics.imaging as imaging
-import winrt.windows.storage.streams as streams
-import winrt.windows.foundation
-from PIL import Image
 
 class Misc:
     def resource_path(self, relative_path):
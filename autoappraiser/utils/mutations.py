@@ -1,5 +1,7 @@
 import customtkinter as ctk
 
+from .matcher import MutationMatcher
+
 class Mutations:
     def populate_mutations(self):
         # Sort lists alphabetically
@@ -23,12 +25,25 @@ class Mutations:
 
         for i, desc in enumerate(self.lists):
             var = ctk.BooleanVar(value=desc in current_selection)
-            cb = ctk.CTkCheckBox(self.mutation_frame, text=desc, variable=var)
+            cb = ctk.CTkCheckBox(self.mutation_frame, text=desc, variable=var, command=self.update_selected_mutations)
             row = i // columns
             col = i % columns
             cb.grid(row=row, column=col, sticky="w", padx=10, pady=8)
             self.checkbox_vars[desc] = var
 
+        self.build_matcher()
+
+    def build_matcher(self):
+        """Precompile the matcher; call whenever the list or selection changes."""
+        selected = [desc for desc, var in self.checkbox_vars.items() if var.get()]
+        self.matcher = MutationMatcher(self.lists, selected)
+        for lane in self.lanes:
+            lane.build_matcher(self.lists)
+
+    def update_selected_mutations(self):
+        # Swap in a new frozenset so the worker never sees a half-built selection
+        self.matcher.selected = frozenset(desc for desc, var in self.checkbox_vars.items() if var.get())
+
     def open_mutation_editor(self):
         top = ctk.CTkToplevel(self.root)
         top.title("Manage Mutations")
@@ -68,8 +83,10 @@ class Mutations:
     def select_all_mutations(self):
         for var in self.checkbox_vars.values():
             var.set(True)
+        self.update_selected_mutations()
 
     def deselect_all_mutations(self):
         for var in self.checkbox_vars.values():
             var.set(False)
+        self.update_selected_mutations()
 
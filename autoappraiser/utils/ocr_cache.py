@@ -0,0 +1,94 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class OcrCache:
+    """
+    Bounded LRU of OCR results keyed by a downsampled hash of the filtered mask.
+
+    The appraisal popup renders the same few strings over and over, so the
+    binarised mask of a repeated text maps to the same key and skips the engine.
+    Entries can be persisted to ``path`` as JSON between sessions.
+    """
+
+    def __init__(self, capacity=256, path=None, hash_size=(64, 16)):
+        self.capacity = capacity
+        self.path = path
+        self.hash_size = hash_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, img):
+        """Hash of the binarised, area-downsampled mask of a filtered image."""
+        if img.ndim == 3:
+            # Filtered text is green, so the green channel alone is a good mask
+            mask = cv2.extractChannel(img, 1)
+        else:
+            mask = img
+        small = cv2.resize(mask, self.hash_size, interpolation=cv2.INTER_AREA)
+        bits = np.packbits(small > 32)
+        return f"{img.shape[0]}x{img.shape[1]}:{bits.tobytes().hex()}"
+
+    def get(self, key):
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key, text):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            with self._lock:
+                for key, text in list(entries.items())[-self.capacity:]:
+                    self._entries[key] = text
+        except Exception as e:
+            print(f"Failed to load OCR cache: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        try:
+            with self._lock:
+                entries = dict(self._entries)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Failed to save OCR cache: {e}")
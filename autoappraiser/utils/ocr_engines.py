@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# WinRT modules, imported by load_winrt() the first time the Windows engine is needed
+ocr = imaging = streams = None
+_winrt_checked = False
+_winrt_lock = threading.Lock()
+
+
+def load_winrt():
+    """Import the WinRT OCR modules on first use; False where they are unavailable."""
+    global ocr, imaging, streams, _winrt_checked
+    # Warm-up and the OCR workers can get here at once; only one does the import
+    with _winrt_lock:
+        if not _winrt_checked:
+            try:
+                import winrt.windows.media.ocr as ocr_module
+                import winrt.windows.graphics.imaging as imaging_module
+                import winrt.windows.storage.streams as streams_module
+            except ImportError:
+                ocr_module = imaging_module = streams_module = None
+            ocr, imaging, streams = ocr_module, imaging_module, streams_module
+            _winrt_checked = True
+    return ocr is not None
+
+
+GRAY8 = "gray8"
+BGRA8 = "bgra8"
+
+
+def to_engine_pixels(img, pixel_format, is_bgra=False):
+    """Convert an RGB/BGRA/gray image into contiguous pixels in ``pixel_format``."""
+    if pixel_format == GRAY8:
+        if img.ndim == 2:
+            return np.ascontiguousarray(img)
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY if is_bgra else cv2.COLOR_RGB2GRAY)
+
+    if img.ndim == 2:
+        return cv2.cvtColor(img, cv2.COLOR_GRAY2BGRA)
+    if is_bgra:
+        return np.ascontiguousarray(img)
+    return cv2.cvtColor(img, cv2.COLOR_RGB2BGRA)
+
+
+class OcrEngine:
+    """
+    Engine-neutral OCR interface.
+
+    ``make_bitmap`` wraps raw pixels (already converted with ``to_engine_pixels``)
+    in whatever image type the engine consumes, and ``recognize`` returns the text.
+    """
+    pixel_format = BGRA8
+
+    def make_bitmap(self, pixels):
+        raise NotImplementedError
+
+    async def recognize(self, bitmap):
+        raise NotImplementedError
+
+
+class WinRtOcrEngine(OcrEngine):
+    """Windows.Media.Ocr fed straight from raw pixels (no PNG round-trip)."""
+
+    def __init__(self, engine, pixel_format=BGRA8):
+        self.engine = engine
+        self.pixel_format = pixel_format
+        self._staging = {}
+
+    @classmethod
+    def create(cls, pixel_format=BGRA8):
+        if not load_winrt():
+            raise RuntimeError("Windows OCR is not available on this platform")
+        engine = ocr.OcrEngine.try_create_from_user_profile_languages()
+        if engine is None:
+            raise RuntimeError("No OCR language installed for the user profile")
+        return cls(engine, pixel_format)
+
+    def _staging_buffer(self, pixels):
+        """Reusable IBuffer per frame size, written through its buffer protocol."""
+        buf = self._staging.get(pixels.nbytes)
+        if buf is None:
+            buf = streams.Buffer(pixels.nbytes)
+            buf.length = pixels.nbytes
+            self._staging[pixels.nbytes] = buf
+        np.copyto(np.frombuffer(memoryview(buf), dtype=np.uint8).reshape(pixels.shape), pixels)
+        return buf
+
+    def make_bitmap(self, pixels):
+        height, width = pixels.shape[:2]
+        try:
+            ibuffer = self._staging_buffer(pixels)
+        except (TypeError, ValueError):
+            # Older WinRT projections don't expose IBuffer memory; go through DataWriter
+            writer = streams.DataWriter()
+            writer.write_bytes(pixels.tobytes())
+            ibuffer = writer.detach_buffer()
+        fmt = imaging.BitmapPixelFormat.GRAY8 if self.pixel_format == GRAY8 else imaging.BitmapPixelFormat.BGRA8
+        return imaging.SoftwareBitmap.create_copy_from_buffer(ibuffer, fmt, width, height)
+
+    async def recognize(self, bitmap):
+        result = await self.engine.recognize_async(bitmap)
+        return result.text
+
+
+class FakeOcrEngine(OcrEngine):
+    """
+    Portable stand-in engine for benchmarks and headless runs.
+
+    Returns ``recognizer(pixels)`` when given, otherwise the ``text`` attribute,
+    after an optional simulated ``delay`` in seconds. ``busy`` seconds of pure
+    Python work per call stand in for marshalling that holds the GIL.
+    """
+    pixel_format = GRAY8
+
+    def __init__(self, text="", delay=0.0, recognizer=None, pixel_format=GRAY8, busy=0.0):
+        self.text = text
+        self.delay = delay
+        self.recognizer = recognizer
+        self.pixel_format = pixel_format
+        self.busy = busy
+
+    def make_bitmap(self, pixels):
+        return pixels
+
+    async def recognize(self, bitmap):
+        if self.busy:
+            deadline = time.perf_counter() + self.busy
+            while time.perf_counter() < deadline:
+                pass
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.recognizer is not None:
+            return self.recognizer(bitmap)
+        return self.text
@@ -1,65 +1,59 @@
-import asyncio
-import io
-import winrt.windows.media.ocr as ocr
-import winrt.windows.graphics.imaging as imaging
-import winrt.windows.storage.streams as streams
-
-from PIL import Image
 import cv2
 import numpy as np
 
+from .frame import Frame
+from .ocr_engines import WinRtOcrEngine, to_engine_pixels
+
+# Green range of the appraisal text in OpenCV HSV (Adjusted for better coverage)
+LOWER_GREEN = np.array([35, 40, 40])
+UPPER_GREEN = np.array([85, 255, 255])
+
 
 class OcrHandler:
     def init_ocr_engine(self):
         try:
-            return ocr.OcrEngine.try_create_from_user_profile_languages()
+            return WinRtOcrEngine.create()
         except Exception as e:
             print(f"Error initializing OCR: {e}")
             return None
 
+    def frame_pixels(self, frame):
+        """Return a captured frame as a numpy image and whether it is BGRA."""
+        if isinstance(frame, Frame):
+            return frame.pixels, frame.is_bgra
+        # Bare numpy arrays are RGB (DXCAM layout)
+        return frame, False
+
+    def frame_to_array(self, frame):
+        """Convert a captured frame to a single-channel text mask and its source channel order."""
+        img, is_bgra = self.frame_pixels(frame)
+        # OCR doesn't need colour, so skip straight to the LUT mask
+        return self.text_filter.mask(img, is_bgra=is_bgra), is_bgra
+
     async def recognize_frame(self, ocr_engine, frame):
         if ocr_engine is None:
             return ""
         try:
-            # 1. Convert to numpy array (OpenCV format)
-            if isinstance(frame, imaging.SoftwareBitmap):
-                # Convert SoftwareBitmap to numpy (BGRA)
-                width = frame.pixel_width
-                height = frame.pixel_height
-                
-                buf = streams.Buffer(width * height * 4)
-                frame.copy_to_buffer(buf)
-                
-                reader = streams.DataReader.from_buffer(buf)
-                pixel_bytes = bytearray(width * height * 4)
-                reader.read_bytes(pixel_bytes)
-                
-                img = np.frombuffer(pixel_bytes, dtype=np.uint8).reshape((height, width, 4))
-                # Apply green filter (BGRA -> HSV -> Mask -> BGRA)
-                img = self.apply_green_filter(img, is_bgra=True)
-            else:
-                # Frame is already numpy (from DXCAM, usually RGB)
-                img = self.apply_green_filter(frame, is_bgra=False)
+            # 1. Convert to numpy array (OpenCV format) and cut out the text line
+            img, is_bgra = self.frame_to_array(frame)
+            if self.use_roi:
+                img = self.text_roi.crop(img, self.text_roi.locate(img))
+        except Exception as e:
+            print(f"OCR Internal Error: {e}")
+            return ""
+        return await self.recognize_array(ocr_engine, img, is_bgra)
+
+    async def recognize_array(self, ocr_engine, img, is_bgra=False):
+        """Recognize an already filtered numpy image."""
+        if ocr_engine is None:
+            return ""
+        try:
+            # 2. Hand the raw pixels to the engine in its native bitmap type
+            pixels = to_engine_pixels(img, ocr_engine.pixel_format, is_bgra)
+            bitmap = ocr_engine.make_bitmap(pixels)
 
-            # 2. Convert back to SoftwareBitmap for Windows OCR
-            # We can use the PIL path or create SoftwareBitmap directly
-            pil_img = Image.fromarray(img).convert("RGB")
-            
-            img_byte_arr = io.BytesIO()
-            pil_img.save(img_byte_arr, format='PNG')
-            img_bytes = img_byte_arr.getvalue()
-            
-            stream = streams.InMemoryRandomAccessStream()
-            writer = streams.DataWriter(stream.get_output_stream_at(0))
-            writer.write_bytes(img_bytes)
-            await writer.store_async()
-            
-            decoder = await imaging.BitmapDecoder.create_async(stream)
-            software_bitmap = await decoder.get_software_bitmap_async()
-            
             # 3. Recognize
-            result = await ocr_engine.recognize_async(software_bitmap)
-            return result.text
+            return await ocr_engine.recognize(bitmap)
 
         except Exception as e:
             print(f"OCR Internal Error: {e}")
@@ -69,16 +63,12 @@ class OcrHandler:
         try:
             # Convert to HSV
             if is_bgra:
-                hsv = cv2.cvtColor(img, cv2.COLOR_BGRA2HSV)
+                hsv = cv2.cvtColor(cv2.cvtColor(img, cv2.COLOR_BGRA2BGR), cv2.COLOR_BGR2HSV)
             else:
                 hsv = cv2.cvtColor(img, cv2.COLOR_RGB2HSV)
 
-            # Define green range (Adjusted for better coverage)
-            lower_green = np.array([35, 40, 40])
-            upper_green = np.array([85, 255, 255])
-
             # Mask only green areas
-            mask = cv2.inRange(hsv, lower_green, upper_green)
+            mask = cv2.inRange(hsv, LOWER_GREEN, UPPER_GREEN)
             
             # Create a black background
             result = np.zeros_like(img)
@@ -0,0 +1,82 @@
+import asyncio
+import concurrent.futures
+import threading
+
+from .cancel import Cancelled
+
+
+class OcrService:
+    """
+    Long-lived thread that owns a single asyncio event loop for OCR work.
+
+    Any thread can ``submit`` a coroutine and get a ``concurrent.futures.Future``
+    back, or call ``run`` to block on the result with an optional timeout. This
+    avoids creating and tearing down an event loop for every recognition.
+    """
+
+    def __init__(self, name="ocr-service"):
+        self.name = name
+        self.loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run_loop, name=self.name, daemon=True)
+            self._thread.start()
+        self._ready.wait()
+        return self
+
+    def _run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.close()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, coro):
+        """Schedule ``coro`` on the service loop; thread-safe."""
+        if not self.running:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None, token=None):
+        """
+        Run ``coro`` on the service loop and wait for it, cancelling it on
+        timeout or when ``token`` (a ``CancelToken``) is cancelled.
+        """
+        future = self.submit(coro)
+        if token is None:
+            try:
+                return future.result(timeout)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                raise
+
+        try:
+            return token.result(future, timeout)
+        except (concurrent.futures.TimeoutError, Cancelled):
+            future.cancel()
+            raise
+
+    def stop(self, timeout=1.0):
+        if not self.running:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
@@ -0,0 +1,95 @@
+import concurrent.futures
+import queue
+import threading
+import time
+
+_STOP = object()
+# Seconds between cancel checks while ``submit`` waits for room
+POLL = 0.05
+
+
+class Pipeline:
+    """
+    Chain of stages that each run on their own thread, linked by bounded queues.
+
+    ``submit`` returns a ``concurrent.futures.Future`` that resolves with the
+    last stage's output. A stage returning ``None`` drops the item (its future
+    resolves to ``None``). Queues are bounded, so a slow stage pushes back on
+    the stages before it and ultimately on ``submit``.
+    """
+
+    def __init__(self, stages, maxsize=1):
+        self.stages = list(stages)
+        self.maxsize = maxsize
+        self._queues = []
+        self._threads = []
+
+    def start(self):
+        if self._threads:
+            return self
+        self._queues = [queue.Queue(maxsize=self.maxsize) for _ in self.stages]
+        for index, (name, fn) in enumerate(self.stages):
+            thread = threading.Thread(target=self._run_stage, args=(index, fn), name=f"pipeline-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(self, item, token=None, timeout=None):
+        """
+        Queue ``item`` for the first stage, blocking while it is full.
+
+        With a ``token`` the wait raises ``Cancelled`` once it is cancelled
+        instead of sitting on a backed-up pipeline.
+        """
+        if not self._threads:
+            self.start()
+        future = concurrent.futures.Future()
+        if token is None:
+            self._queues[0].put((future, item), timeout=timeout)
+            return future
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            token.check()
+            wait = POLL if deadline is None else min(POLL, deadline - time.monotonic())
+            try:
+                self._queues[0].put((future, item), timeout=max(0.0, wait))
+                return future
+            except queue.Full:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+
+    def _run_stage(self, index, fn):
+        inbox = self._queues[index]
+        outbox = self._queues[index + 1] if index + 1 < len(self._queues) else None
+        while True:
+            entry = inbox.get()
+            if entry is _STOP:
+                if outbox is not None:
+                    outbox.put(_STOP)
+                return
+
+            future, item = entry
+            if index == 0 and not future.set_running_or_notify_cancel():
+                continue
+            if future.done():
+                continue
+
+            try:
+                result = fn(item)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+
+            if result is None or outbox is None:
+                future.set_result(result)
+            else:
+                outbox.put((future, result))
+
+    def stop(self, timeout=1.0):
+        if not self._threads:
+            return
+        self._queues[0].put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
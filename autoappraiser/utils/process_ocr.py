@@ -0,0 +1,252 @@
+import asyncio
+import concurrent.futures
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .mask_gate import MaskGate
+from .ocr_engines import FakeOcrEngine, WinRtOcrEngine
+from .ocr_handler import OcrHandler
+from .text_filter import DEFAULT_RANGES, TextFilter
+from .text_roi import TextRoi
+
+PREPARE = "prepare"
+RECOGNIZE = "recognize"
+# Default seconds to wait for a free slot before giving up
+SLOT_TIMEOUT = 1.0
+# How often waits for a slot or a result look at the token and the workers
+POLL = 0.1
+
+
+def create_engine(spec):
+    """OCR engine for a worker: ``"winrt"``, or a dict of ``FakeOcrEngine`` arguments."""
+    if spec == "winrt":
+        return WinRtOcrEngine.create()
+    return FakeOcrEngine(**spec)
+
+
+def _worker_main(shm_name, slot_bytes, tasks, results, ranges, text_height, use_roi, engine_spec):
+    # Runs in a worker process: everything it needs is rebuilt here, frames
+    # are read from and crops written back to the shared memory slots
+    shm = shared_memory.SharedMemory(name=shm_name)
+    text_filter = TextFilter(ranges)
+    text_filter.lut
+    text_roi = TextRoi(text_height)
+    gate = MaskGate()
+    handler = OcrHandler()
+    loop = asyncio.new_event_loop()
+    try:
+        engine = create_engine(engine_spec)
+    except Exception as e:
+        print(f"OCR worker could not create its engine: {e}")
+        engine = None
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            job_id, kind, slot, shape, is_bgra = task
+            offset = slot * slot_bytes
+            try:
+                pixels = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+                if kind == PREPARE:
+                    mask = text_filter.mask(pixels, is_bgra)
+                    stats = gate.stats(mask)
+                    crop = text_roi.crop(mask, text_roi.locate(mask)) if use_roi else mask
+                    if crop.nbytes > slot_bytes:
+                        # A scaled-up crop can outgrow the frame; OCR the mask itself, which never does
+                        crop = mask
+                    if crop.nbytes > slot_bytes:
+                        raise ValueError(f"{crop.nbytes} byte text mask does not fit a {slot_bytes} byte slot")
+                    # The frame is no longer needed, so the crop goes back in its slot
+                    np.ndarray(crop.shape, dtype=np.uint8, buffer=shm.buf, offset=offset)[...] = crop
+                    results.put((job_id, (crop.shape, stats), None))
+                else:
+                    text = loop.run_until_complete(handler.recognize_array(engine, pixels))
+                    results.put((job_id, text, None))
+            except Exception as e:
+                results.put((job_id, None, repr(e)))
+            finally:
+                pixels = None
+    finally:
+        loop.close()
+        shm.close()
+
+
+class ProcessOcr:
+    """
+    Text filtering and OCR in ``workers`` separate processes.
+
+    Keeps the numpy/cv2 filter work and the OCR engine's marshalling off the
+    interpreter that runs the GUI, hotkeys and input timeline. Frames are
+    copied into one of ``slots`` fixed-size slots of a shared memory block
+    (never pickled); a task queue carries only the slot index and shape, and
+    the worker writes its text crop back into the same slot. Results come
+    back on a queue and resolve the futures ``prepare`` and ``recognize``
+    return. A slot stays in use until its result is in, so at most ``slots``
+    frames are in flight and ``prepare`` waits for one beyond that (up to
+    ``timeout``, or until ``token`` is cancelled).
+
+    If a worker process dies its slot never comes back, so the whole pool is
+    marked dead: every pending future fails and ``alive`` turns False, and
+    the app goes back to filtering and OCR on its own threads.
+    """
+
+    def __init__(self, workers=2, slots=8, slot_bytes=1 << 20, ranges=DEFAULT_RANGES, text_height=32,
+                 use_roi=True, engine="winrt"):
+        self.workers = workers
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.ranges = tuple(ranges)
+        self.text_height = text_height
+        self.use_roi = use_roi
+        self.engine = engine
+        self._shm = None
+        self._procs = []
+        self._futures = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._dead = None
+        self._closing = threading.Event()
+
+    def fits(self, img):
+        return img.nbytes <= self.slot_bytes
+
+    def alive(self):
+        """Whether the workers are running and can take frames."""
+        return bool(self._procs) and self._check_workers() is None
+
+    def _check_workers(self):
+        """Reason the pool can't be used (a worker exited), or None."""
+        if self._dead is None:
+            for proc in self._procs:
+                if not proc.is_alive():
+                    self._fail(f"OCR worker {proc.name} exited with code {proc.exitcode}")
+                    break
+        return self._dead
+
+    def _fail(self, reason):
+        with self._lock:
+            if self._dead is None:
+                self._dead = reason
+            futures, self._futures = list(self._futures.values()), {}
+        for future, _, _ in futures:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError(reason))
+
+    def start(self):
+        if self._procs:
+            return self
+        self._dead = None
+        self._closing = threading.Event()
+        # spawn everywhere, so the workers behave the same as on Windows
+        ctx = multiprocessing.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=self.slots * self.slot_bytes)
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        self._free = queue.Queue()
+        for slot in range(self.slots):
+            self._free.put(slot)
+        args = (self._shm.name, self.slot_bytes, self._tasks, self._results,
+                self.ranges, self.text_height, self.use_roi, self.engine)
+        self._procs = [ctx.Process(target=_worker_main, args=args, name=f"ocr-worker-{i}", daemon=True)
+                       for i in range(self.workers)]
+        for proc in self._procs:
+            proc.start()
+        self._collector = threading.Thread(target=self._collect, name="ocr-results", daemon=True)
+        self._collector.start()
+        return self
+
+    def _slot_view(self, slot, shape):
+        return np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf, offset=slot * self.slot_bytes)
+
+    def _acquire_slot(self, token, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            if token is not None:
+                token.check()
+            reason = self._check_workers()
+            if reason is not None:
+                raise RuntimeError(reason)
+            try:
+                return self._free.get(timeout=max(0.0, min(POLL, deadline - time.monotonic())))
+            except queue.Empty:
+                if time.monotonic() >= deadline:
+                    raise concurrent.futures.TimeoutError(f"no free OCR slot within {timeout} s")
+
+    def _submit(self, kind, img, is_bgra, token, timeout):
+        if not self.fits(img):
+            raise ValueError(f"{img.nbytes} byte image does not fit a {self.slot_bytes} byte slot")
+        slot = self._acquire_slot(token, timeout)
+        self._slot_view(slot, img.shape)[...] = img
+        future = concurrent.futures.Future()
+        job_id = next(self._ids)
+        with self._lock:
+            self._futures[job_id] = (future, slot, kind)
+        self._tasks.put((job_id, kind, slot, img.shape, is_bgra))
+        return future
+
+    def prepare(self, img, is_bgra=False, token=None, timeout=SLOT_TIMEOUT):
+        """Future of ``(text crop, mask stats)`` for a captured frame."""
+        return self._submit(PREPARE, img, is_bgra, token, timeout)
+
+    def recognize(self, img, token=None, timeout=SLOT_TIMEOUT):
+        """Future of the OCR text of a (cropped) text mask."""
+        return self._submit(RECOGNIZE, img, False, token, timeout)
+
+    def _collect(self):
+        while True:
+            try:
+                message = self._results.get(timeout=POLL)
+            except queue.Empty:
+                if self._closing.is_set():
+                    return
+                self._check_workers()
+                continue
+            job_id, value, error = message
+            with self._lock:
+                entry = self._futures.pop(job_id, None)
+            if entry is None:
+                # Failed already when a worker died
+                continue
+            future, slot, kind = entry
+            if error is None and kind == PREPARE:
+                shape, stats = value
+                value = (self._slot_view(slot, shape).copy(), stats)
+            self._free.put(slot)
+            # The caller may have given up on it (cancel, timeout)
+            if not future.set_running_or_notify_cancel():
+                continue
+            if error is not None:
+                future.set_exception(RuntimeError(f"OCR worker failed: {error}"))
+            else:
+                future.set_result(value)
+
+    def stop(self, timeout=1.0):
+        if not self._procs:
+            return
+        for _ in self._procs:
+            self._tasks.put(None)
+        for proc in self._procs:
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+        self._procs = []
+        # Tasks no worker will read again mustn't hold up interpreter exit
+        self._tasks.cancel_join_thread()
+        self._tasks.close()
+        # Not a sentinel on the results queue: a killed worker can leave its write lock held
+        self._closing.set()
+        self._collector.join(timeout)
+        with self._lock:
+            for future, _, _ in self._futures.values():
+                future.cancel()
+            self._futures.clear()
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
@@ -0,0 +1,155 @@
+import time
+
+from .cancel import CancelToken
+
+try:
+    import keyboard as kb
+except ImportError:
+    kb = None
+
+# Imported by PyDirectInput.load(), off the startup path
+pydirectinput = None
+
+# Last stretch before a deadline that is spun instead of slept, to absorb sleep overshoot
+SPIN = 0.002
+
+
+def move(x, y):
+    return ("move", (x, y))
+
+
+def click():
+    return ("click", ())
+
+
+def key(name):
+    return ("key", (str(name),))
+
+
+def wait(seconds):
+    """Push the next step ``seconds`` past the previous step's deadline."""
+    return ("wait", (seconds,))
+
+
+def at(offset):
+    """Run the next step ``offset`` seconds after the sequence started."""
+    return ("at", (offset,))
+
+
+def call(fn, *args):
+    """Run ``fn(*args)`` on the timeline, e.g. to arm a trigger between clicks."""
+    return ("call", (fn,) + args)
+
+
+class PyDirectInput:
+    """Real input backend: pydirectinput for the mouse, keyboard for keys."""
+
+    def load(self):
+        """Import pydirectinput; called during warm-up, and again on first use if it was skipped."""
+        global pydirectinput
+        if pydirectinput is None:
+            import pydirectinput as module
+            pydirectinput = module
+
+    def position(self):
+        self.load()
+        return pydirectinput.position()
+
+    def move(self, x, y):
+        self.load()
+        pydirectinput.moveTo(x, y)
+
+    def click(self):
+        self.load()
+        pydirectinput.click()
+
+    def key(self, name):
+        kb.press_and_release(name)
+
+
+class FakeInput:
+    """
+    Headless input backend that records ``(monotonic time, action, args)``
+    and can take ``delay`` seconds per call like a real input API.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.events = []
+        self.cursor = (0, 0)
+
+    def load(self):
+        pass
+
+    def position(self):
+        return self.cursor
+
+    def _record(self, action, *args):
+        self.events.append((time.monotonic(), action, args))
+        if self.delay:
+            time.sleep(self.delay)
+
+    def move(self, x, y):
+        self.cursor = (x, y)
+        self._record("move", x, y)
+
+    def click(self):
+        self._record("click")
+
+    def key(self, name):
+        self._record("key", name)
+
+
+class ActionScheduler:
+    """
+    Runs declarative input timelines against monotonic deadlines.
+
+    A sequence is a list of steps (``move``, ``click``, ``key``, ``call``,
+    ``wait`` and ``at``). Waits move a deadline that is measured from the
+    start of the sequence instead of from the end of the previous step, so
+    the time the input calls themselves take does not add up over a sequence.
+    Each deadline is slept toward and the last ``spin`` seconds are
+    spun, which avoids the overshoot of one long ``time.sleep``. The waits
+    release the GIL, so the pipeline, logging and GUI threads run meanwhile.
+    Waits are on the ``CancelToken`` passed to ``run``, so cancelling it stops
+    the sequence before the next input call.
+    """
+
+    def __init__(self, backend=None, spin=SPIN):
+        self.backend = backend if backend is not None else PyDirectInput()
+        self.spin = spin
+        self.lateness = []
+
+    def wait_until(self, deadline, token):
+        remaining = deadline - time.monotonic()
+        if remaining > self.spin:
+            token.sleep(remaining - self.spin)
+        while time.monotonic() < deadline:
+            token.check()
+            time.sleep(0)
+        token.check()
+
+    def run(self, steps, token=None):
+        """Run ``steps`` and return the seconds each action fired after its deadline."""
+        token = token if token is not None else CancelToken()
+        start = time.monotonic()
+        deadline = start
+        lateness = []
+        for kind, args in steps:
+            if kind == "wait":
+                deadline += args[0]
+                continue
+            if kind == "at":
+                deadline = start + args[0]
+                continue
+
+            self.wait_until(deadline, token)
+            lateness.append(time.monotonic() - deadline)
+            if kind == "call":
+                args[0](*args[1:])
+            else:
+                getattr(self.backend, kind)(*args)
+        # Trailing waits still hold the caller until their deadline
+        self.wait_until(deadline, token)
+        self.lateness = lateness
+        return lateness
@@ -0,0 +1,113 @@
+import json
+import os
+import queue
+import threading
+import time
+
+_STOP = object()
+# A log that would grow past this is moved to <path>.1 (replacing the older one) and restarted
+MAX_BYTES = 16 * 1024 * 1024
+
+
+def make_record(job):
+    """Compact log record of one finished appraisal job."""
+    record = {
+        't': round(time.time(), 3),
+        'text': job.get('text') or "",
+        'match': job.get('match'),
+        'score': round(job['score'], 1) if job.get('score') is not None else None,
+        'ms': job.get('ms', {}),
+    }
+    if job.get('lane') is not None:
+        record['lane'] = job['lane'].name
+    if job.get('found'):
+        record['kept'] = True
+    if job.get('skipped'):
+        record['skipped'] = True
+    return record
+
+
+class SessionLog:
+    """
+    Append-only JSON-lines log of appraisal outcomes.
+
+    ``append`` only queues the record; a background thread serialises queued
+    records and writes them in batches of up to ``batch`` lines, flushing at
+    least every ``flush_interval`` seconds, so the appraisal threads never
+    wait on the disk. At ``max_bytes`` the file is rotated to ``<path>.1``,
+    so at most two files' worth of log is kept.
+    """
+
+    def __init__(self, path, batch=64, flush_interval=2.0, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.batch = batch
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+
+    def start(self):
+        if self.path and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="session-log", daemon=True)
+            self._thread.start()
+        return self
+
+    def append(self, record):
+        if self._thread is not None:
+            self._queue.put(record)
+
+    def _run(self):
+        try:
+            f = open(self.path, "a", encoding="utf-8")
+        except OSError as e:
+            print(f"Failed to open session log: {e}")
+            self._thread = None
+            return
+
+        try:
+            running = True
+            while running:
+                lines = []
+                deadline = time.monotonic() + self.flush_interval
+                while len(lines) < self.batch:
+                    try:
+                        record = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if record is _STOP:
+                        running = False
+                        break
+                    lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+                if not lines:
+                    continue
+                chunk = "".join(lines)
+                try:
+                    if f.tell() and f.tell() + len(chunk) > self.max_bytes:
+                        f = self._rotate(f)
+                    f.write(chunk)
+                    f.flush()
+                    self.written += len(lines)
+                except OSError as e:
+                    self.dropped += len(lines)
+                    print(f"Failed to write session log: {e}")
+        finally:
+            f.close()
+
+    def _rotate(self, f):
+        f.close()
+        try:
+            os.replace(self.path, self.path + ".1")
+        except OSError as e:
+            # Keep appending to the same file rather than losing records
+            print(f"Failed to rotate session log: {e}")
+        return open(self.path, "a", encoding="utf-8")
+
+    def stop(self, timeout=2.0):
+        """Write out everything queued so far and close the file."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
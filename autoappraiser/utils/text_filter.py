@@ -0,0 +1,119 @@
+import functools
+import threading
+
+import cv2
+import numpy as np
+
+from .ocr_handler import LOWER_GREEN, UPPER_GREEN
+
+# (lower, upper) OpenCV HSV bounds; a lower hue above the upper hue wraps through red
+DEFAULT_RANGES = ((tuple(LOWER_GREEN), tuple(UPPER_GREEN)),)
+
+
+def parse_ranges(config_ranges):
+    """Turn config rows ``[h_lo, s_lo, v_lo, h_hi, s_hi, v_hi]`` into filter ranges."""
+    ranges = []
+    for row in config_ranges:
+        if len(row) != 6:
+            print(f"Ignoring colour range {row}: expected 6 values")
+            continue
+        ranges.append((tuple(int(v) for v in row[:3]), tuple(int(v) for v in row[3:])))
+    return tuple(ranges) or DEFAULT_RANGES
+
+
+@functools.lru_cache(maxsize=4)
+def build_lut(ranges):
+    """
+    24-bit colour -> 0/255 lookup table for ``ranges``, indexed by ``r << 16 | g << 8 | b``.
+
+    Built one red plane at a time so the HSV conversion never needs more than a
+    256x256 scratch image.
+    """
+    lut = np.empty(1 << 24, dtype=np.uint8)
+    g, b = np.meshgrid(np.arange(256, dtype=np.uint8), np.arange(256, dtype=np.uint8), indexing="ij")
+    plane = np.empty((256, 256, 3), dtype=np.uint8)
+    plane[..., 1] = g
+    plane[..., 2] = b
+    for r in range(256):
+        plane[..., 0] = r
+        hsv = cv2.cvtColor(plane, cv2.COLOR_RGB2HSV)
+        hit = np.zeros((256, 256), dtype=bool)
+        for lower, upper in ranges:
+            h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+            if lower[0] <= upper[0]:
+                hue = (h >= lower[0]) & (h <= upper[0])
+            else:
+                hue = (h >= lower[0]) | (h <= upper[0])
+            hit |= hue & (s >= lower[1]) & (s <= upper[1]) & (v >= lower[2]) & (v <= upper[2])
+        lut[r << 16:(r + 1) << 16] = hit.reshape(-1) * np.uint8(255)
+    lut.setflags(write=False)
+    return lut
+
+
+class TextFilter:
+    """
+    Allocation-free colour filter for the appraisal text.
+
+    The HSV range test is precomputed into a 24-bit lookup table, so filtering
+    a frame is one channel shuffle into a packed index buffer plus one table
+    lookup, with no per-frame allocation. Output buffers are
+    preallocated per resolution and thread and handed out round-robin from a
+    ring of ``depth`` slots: a returned array stays valid until the same
+    thread has filtered ``depth`` more frames of the same size. Threads never
+    share buffers, so the trigger poller and the filter stage don't wait on
+    each other.
+    """
+
+    def __init__(self, ranges=DEFAULT_RANGES, depth=8):
+        self.ranges = tuple((tuple(lo), tuple(hi)) for lo, hi in ranges)
+        self.depth = depth
+        self._lut = None
+        self._local = threading.local()
+
+    @property
+    def lut(self):
+        if self._lut is None:
+            self._lut = build_lut(self.ranges)
+        return self._lut
+
+    def _slot(self, shape):
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        ring = buffers.get(shape)
+        if ring is None:
+            # Each pixel gets 8 zeroed bytes; writing B, G, R into the low three
+            # makes the row readable as int64 LUT indices without any casting
+            packed = np.zeros(shape + (8,), dtype=np.uint8)
+            ring = buffers[shape] = {
+                'next': 0,
+                'packed': packed,
+                'idx': packed.view(np.int64)[..., 0],
+                'mask': [np.empty(shape, dtype=np.uint8) for _ in range(self.depth)],
+                'color': {},
+            }
+        i = ring['next']
+        ring['next'] = (i + 1) % self.depth
+        return ring, i
+
+    def mask(self, img, is_bgra=False):
+        """Single-channel 0/255 text mask of an RGB, BGRA or RGBA frame."""
+        return self._mask(img, is_bgra)[0]
+
+    def _mask(self, img, is_bgra):
+        ring, i = self._slot(img.shape[:2])
+        # Little-endian B, G, R bytes == r << 16 | g << 8 | b
+        from_to = [0, 0, 1, 1, 2, 2] if is_bgra else [0, 2, 1, 1, 2, 0]
+        cv2.mixChannels([img], [ring['packed']], from_to)
+        mask = np.take(self.lut, ring['idx'], out=ring['mask'][i], mode="clip")
+        return mask, ring, i
+
+    def apply(self, img, is_bgra=False):
+        """Colour-preserving variant: ``img`` with everything outside the ranges blacked out."""
+        mask, ring, i = self._mask(img, is_bgra)
+        out = ring['color'].get((i, img.shape))
+        if out is None:
+            out = ring['color'][(i, img.shape)] = np.empty(img.shape, dtype=np.uint8)
+        out.fill(0)
+        cv2.copyTo(img, mask, out)
+        return out
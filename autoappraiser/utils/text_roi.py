@@ -0,0 +1,116 @@
+import cv2
+
+# Boxes shorter than this are specks or rules, not text; OCR gets the whole mask instead
+MIN_BOX_HEIGHT = 4
+# Upper bound on the upscale of small text, so a thin box can't become a huge image
+MAX_SCALE = 4.0
+
+
+class TextRoi:
+    """
+    Tight text-line crop for OCR, plus tracking of where that line sits.
+
+    ``crop`` cuts the bounding box of a text mask out with a margin and scales
+    it so the text is ``text_height`` pixels tall: OCR cost grows with image
+    area and its accuracy with glyph height, so a small, fixed-height crop is
+    both faster and steadier than the whole capture box.
+
+    ``mask`` remembers the union of the boxes it has found (padded by
+    ``slack`` text heights and snapped outward to ``grid`` pixels, so the
+    filter's per-size buffers stay few) and, after ``min_hits`` frames, only
+    filters that window. A window that comes back empty, or with the text
+    touching one of its inner edges, falls back to the full frame and starts
+    tracking again from there.
+    """
+
+    def __init__(self, text_height=32, margin=0.25, slack=0.5, grid=16, min_hits=2):
+        self.text_height = text_height
+        self.margin = margin
+        self.slack = slack
+        self.grid = grid
+        self.min_hits = min_hits
+        self.hits = 0
+        self.misses = 0
+        self._union = None
+
+    def locate(self, mask):
+        """Bounding box ``(x, y, w, h)`` of the lit pixels in ``mask``, or None when it is empty."""
+        x, y, w, h = cv2.boundingRect(mask)
+        return (x, y, w, h) if w and h else None
+
+    def crop(self, mask, box):
+        """``mask`` cut to ``box`` plus margin and scaled to ``text_height``; ``mask`` itself without a usable box."""
+        if box is None or box[3] < MIN_BOX_HEIGHT:
+            return mask
+        x, y, w, h = box
+        pad = max(2, int(h * self.margin))
+        rows, cols = mask.shape[:2]
+        crop = mask[max(0, y - pad):min(rows, y + h + pad), max(0, x - pad):min(cols, x + w + pad)]
+        scale = min(self.text_height / h, MAX_SCALE)
+        if 0.9 <= scale <= 1.1:
+            # Close enough; a resample would only blur the glyphs
+            return crop
+        size = (max(1, round(crop.shape[1] * scale)), max(1, round(crop.shape[0] * scale)))
+        return cv2.resize(crop, size, interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR)
+
+    def window(self, shape):
+        """Tracked ``(x0, y0, x1, y1)`` pre-crop window inside a frame of ``shape``, or None."""
+        if self._union is None or self.hits < self.min_hits:
+            return None
+        x0, y0, x1, y1 = self._union
+        pad = max(self.grid, int((y1 - y0) * self.slack))
+        g = self.grid
+        rows, cols = shape[:2]
+        return (
+            max(0, (x0 - pad) // g * g),
+            max(0, (y0 - pad) // g * g),
+            min(cols, -(-(x1 + pad) // g) * g),
+            min(rows, -(-(y1 + pad) // g) * g),
+        )
+
+    def reset(self):
+        self.hits = 0
+        self._union = None
+
+    def _record(self, box):
+        x, y, w, h = box
+        if self._union is None:
+            self._union = (x, y, x + w, y + h)
+        else:
+            ux0, uy0, ux1, uy1 = self._union
+            self._union = (min(ux0, x), min(uy0, y), max(ux1, x + w), max(uy1, y + h))
+        self.hits += 1
+
+    def _clipped(self, box, window, shape):
+        """Whether ``box`` (window coordinates) runs into a window edge that isn't the frame's."""
+        x, y, w, h = box
+        x0, y0, x1, y1 = window
+        rows, cols = shape[:2]
+        return (
+            (x == 0 and x0 > 0) or (y == 0 and y0 > 0)
+            or (x + w == x1 - x0 and x1 < cols) or (y + h == y1 - y0 and y1 < rows)
+        )
+
+    def mask(self, text_filter, img, is_bgra=False):
+        """
+        Text mask of ``img`` (pre-cropped to the tracked window when there is one)
+        and the text box inside that mask, or None when no text was found.
+        """
+        window = self.window(img.shape)
+        if window is not None:
+            x0, y0, x1, y1 = window
+            mask = text_filter.mask(img[y0:y1, x0:x1], is_bgra)
+            box = self.locate(mask)
+            if box is not None and not self._clipped(box, window, img.shape):
+                self._record((box[0] + x0, box[1] + y0, box[2], box[3]))
+                return mask, box
+            self.misses += 1
+
+        mask = text_filter.mask(img, is_bgra)
+        box = self.locate(mask)
+        if box is not None:
+            if window is not None:
+                # The text moved or grew out of the window: track it afresh
+                self.reset()
+            self._record(box)
+        return mask, box
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+
+import cv2
+import numpy as np
+
+
+class TextTemplateIndex:
+    """
+    Nearest-neighbour recogniser for text the OCR engine has already read.
+
+    Each OCR-labelled crop is reduced to a ``size`` vector (area downsample,
+    zero mean, unit norm), so the dot product of two vectors is their
+    normalised cross-correlation. ``classify`` returns the label of the best
+    exemplar when it correlates at least ``min_score`` and beats the best
+    exemplar of any other label by ``margin``; anything less confident
+    returns None and goes to the OCR engine. Exemplars whose aspect ratio is
+    more than ``aspect_tolerance`` off are not considered, which keeps short
+    and long names apart before any pixels are compared.
+    """
+
+    def __init__(self, path=None, size=(96, 24), min_score=0.92, margin=0.05, per_label=8, aspect_tolerance=0.15):
+        self.path = path
+        self.size = size
+        self.min_score = min_score
+        self.margin = margin
+        self.per_label = per_label
+        self.aspect_tolerance = aspect_tolerance
+        self._labels = []
+        self._aspects = np.empty(0, dtype=np.float32)
+        self._vectors = np.empty((0, size[0] * size[1]), dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._labels)
+
+    def vector(self, img):
+        """``(unit vector, aspect ratio)`` of a single-channel text crop, or None if it is blank."""
+        small = cv2.resize(img, self.size, interpolation=cv2.INTER_AREA).astype(np.float32).ravel()
+        small -= small.mean()
+        norm = float(np.linalg.norm(small))
+        if norm == 0:
+            return None
+        return small / norm, img.shape[1] / img.shape[0]
+
+    def classify(self, img):
+        """``(label, score)`` of a confident match for ``img``, else None."""
+        vec = self.vector(img)
+        if vec is None:
+            return None
+        v, aspect = vec
+        with self._lock:
+            if not self._labels:
+                return None
+            scores = self._vectors @ v
+            scores[np.abs(self._aspects - aspect) > self.aspect_tolerance * aspect] = -1.0
+            best = int(np.argmax(scores))
+            label, score = self._labels[best], float(scores[best])
+            others = [s for s, l in zip(scores, self._labels) if l != label]
+        if score < self.min_score:
+            return None
+        if others and score - max(others) < self.margin:
+            return None
+        return label, score
+
+    def learn(self, img, label):
+        """Add an OCR-labelled crop, keeping the newest ``per_label`` exemplars of each label."""
+        vec = self.vector(img)
+        if vec is None or not label:
+            return
+        v, aspect = vec
+        with self._lock:
+            same = [i for i, l in enumerate(self._labels) if l == label]
+            if same and float(np.max(self._vectors[same] @ v)) > 0.99:
+                # Nearly identical to an exemplar we have
+                return
+            if len(same) >= self.per_label:
+                self._remove([same[0]])
+            self._labels.append(label)
+            self._aspects = np.append(self._aspects, np.float32(aspect))
+            self._vectors = np.vstack([self._vectors, v[None, :]])
+
+    def forget(self, label):
+        """Drop every exemplar of ``label``, e.g. after the OCR engine disagreed with it."""
+        with self._lock:
+            self._remove([i for i, l in enumerate(self._labels) if l == label])
+
+    def _remove(self, indices):
+        keep = np.ones(len(self._labels), dtype=bool)
+        keep[indices] = False
+        self._labels = [l for l, k in zip(self._labels, keep) if k]
+        self._aspects = self._aspects[keep]
+        self._vectors = self._vectors[keep]
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                vectors = data['vectors'].astype(np.float32)
+                aspects = data['aspects'].astype(np.float32)
+                labels = json.loads(str(data['labels']))
+            if vectors.shape[1:] != self._vectors.shape[1:] or len(labels) != len(vectors):
+                print("Ignoring text templates saved with a different size")
+                return
+            with self._lock:
+                self._labels, self._aspects, self._vectors = labels, aspects, vectors
+        except Exception as e:
+            print(f"Failed to load text templates: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        try:
+            with self._lock:
+                labels = json.dumps(self._labels)
+                aspects, vectors = self._aspects.copy(), self._vectors.astype(np.float16)
+            tmp_path = self.path + ".tmp.npz"
+            np.savez_compressed(tmp_path, vectors=vectors, aspects=aspects, labels=np.array(labels))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Failed to save text templates: {e}")
@@ -0,0 +1,151 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from .cancel import CancelToken
+from .frame import release
+from .ocr_handler import LOWER_GREEN, UPPER_GREEN
+
+
+class TextTrigger:
+    """
+    Detects when appraisal text has appeared in the capture box.
+
+    Once ``arm``-ed, a poller thread grabs the capture box every
+    ``poll_interval`` seconds and compares a downsampled green mask with the
+    previous one. ``wait`` returns as soon as the mask has changed since arming,
+    holds some lit pixels and has stayed the same for ``settle_polls`` polls,
+    or after ``max_wait`` seconds at the latest. ``changed_at`` is the
+    monotonic time of the poll that saw the last change before settling.
+    """
+
+    def __init__(self, grab, to_pixels, poll_interval=0.015, max_wait=0.8, settle_polls=2, step=3,
+                 min_lit=0.004, change_ratio=0.01, text_filter=None):
+        self.grab = grab
+        self.to_pixels = to_pixels
+        self.text_filter = text_filter
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self.settle_polls = settle_polls
+        self.step = step
+        self.min_lit = min_lit
+        self.change_ratio = change_ratio
+
+        self._armed = threading.Event()
+        self._cond = threading.Condition()
+        self._busy = threading.Lock()
+        self._thread = None
+        self._generation = 0
+        self.frame = None
+        self._reset()
+
+    def _reset(self):
+        self.changed = False
+        self.changed_at = None
+        self.settled = False
+        # The trigger holds the newest frame until ``wait`` hands it over
+        release(self.frame)
+        self.frame = None
+
+    def mask(self, frame):
+        """Cheap text-colour mask of every ``step``-th pixel of ``frame``."""
+        img, is_bgra = self.to_pixels(frame)
+        small = np.ascontiguousarray(img[::self.step, ::self.step, :3])
+        if self.text_filter is not None:
+            return self.text_filter.mask(small, is_bgra).copy()
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV if is_bgra else cv2.COLOR_RGB2HSV)
+        return cv2.inRange(hsv, LOWER_GREEN, UPPER_GREEN)
+
+    def arm(self):
+        """Start watching for text; call right before the input that triggers it."""
+        with self._cond:
+            self._reset()
+            self._generation += 1
+        self._armed.set()
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._poll, name="text-trigger", daemon=True)
+            self._thread.start()
+
+    def disarm(self):
+        self._armed.clear()
+        # Let an in-flight poll finish so the caller owns the camera again
+        with self._busy:
+            pass
+
+    def _wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def wait(self, max_wait=None, token=None):
+        """
+        Block until the text has settled or ``max_wait`` elapses; returns the last
+        frame. Raises ``Cancelled`` straight away if ``token`` gets cancelled.
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        token = token if token is not None else CancelToken()
+        deadline = time.monotonic() + max_wait
+        callback = token.add_callback(self._wake)
+        try:
+            with self._cond:
+                while not self.settled and not token.cancelled:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                frame = None
+                if self.settled:
+                    # The caller owns (and releases) the frame from here on
+                    frame, self.frame = self.frame, None
+        finally:
+            token.remove_callback(callback)
+            self.disarm()
+        if token.cancelled:
+            release(frame)
+        token.check()
+        return frame
+
+    def _poll(self):
+        prev = None
+        stable = 0
+        generation = None
+        while True:
+            self._armed.wait()
+            with self._busy:
+                if not self._armed.is_set():
+                    continue
+                if generation != self._generation:
+                    # Re-armed: start a fresh comparison chain
+                    prev, stable, generation = None, 0, self._generation
+                grabbed_at = time.monotonic()
+                try:
+                    frame = self.grab()
+                except Exception as e:
+                    print(f"Text trigger grab error: {e}")
+                    frame = None
+
+                with self._cond:
+                    if frame is not None:
+                        mask = self.mask(frame)
+                        if prev is not None and prev.shape == mask.shape:
+                            diff = np.count_nonzero(mask != prev)
+                            if diff > max(2, self.change_ratio * mask.size):
+                                self.changed = True
+                                self.changed_at = grabbed_at
+                                stable = 0
+                            else:
+                                stable += 1
+                        prev = mask
+                        release(self.frame)
+                        self.frame = frame
+                    else:
+                        # Some backends return None when nothing on screen changed
+                        stable += 1
+
+                    lit = prev is not None and np.count_nonzero(prev) >= self.min_lit * prev.size
+                    self.settled = self.changed and lit and stable >= self.settle_polls and self.frame is not None
+                    if self.settled:
+                        self._cond.notify_all()
+
+            time.sleep(self.poll_interval)
@@ -0,0 +1,80 @@
+import threading
+import time
+
+# Length of the Actions.do_totem timeline (its waits add up to 3.3 s)
+TOTEM_DURATION = 3.3
+# A cycle sample counts for at most this many times the current estimate
+MAX_CYCLE_JUMP = 3.0
+
+
+class TotemPlanner:
+    """
+    Monotonic-clock plan of when the next totem is due.
+
+    The totem lasts ``interval`` seconds from its last use. Instead of
+    checking for expiry at the top of every cycle, the worker asks at the
+    gap after each capture whether the totem will run out before the next
+    cycle could finish (``use_in_gap``); if so the totem is used now, in that
+    gap, rather than in the middle of the next appraisal. ``cycle`` keeps a
+    running estimate of how long a cycle takes to make that prediction.
+    """
+
+    def __init__(self, interval, duration=TOTEM_DURATION, smoothing=0.2):
+        self.interval = interval
+        self.duration = duration
+        self.smoothing = smoothing
+        self.cycle_estimate = None
+        self.last_used = None
+        self._cycle_start = None
+        self._lock = threading.Lock()
+
+    @property
+    def next_due(self):
+        """Monotonic time the current totem runs out, or None if none was used yet."""
+        with self._lock:
+            return None if self.last_used is None else self.last_used + self.interval
+
+    def remaining(self):
+        """Seconds until the totem is due (0 when overdue or never used)."""
+        due = self.next_due
+        return 0.0 if due is None else max(0.0, due - time.monotonic())
+
+    def overdue(self):
+        return self.remaining() <= 0
+
+    def cycle(self):
+        """Mark the start of an appraisal cycle and update the cycle-length estimate."""
+        now = time.monotonic()
+        with self._lock:
+            if self._cycle_start is not None:
+                length = now - self._cycle_start
+                if self.last_used is not None and self.last_used > self._cycle_start:
+                    # Leave the totem's own time out of the appraisal cycle estimate
+                    length = max(0.0, length - self.duration)
+                if self.cycle_estimate is None:
+                    self.cycle_estimate = length
+                else:
+                    # One stalled cycle (a hitch, a slow OCR) shouldn't pull the totem forward for long
+                    length = min(length, self.cycle_estimate * MAX_CYCLE_JUMP)
+                    self.cycle_estimate += self.smoothing * (length - self.cycle_estimate)
+            self._cycle_start = now
+
+    def pause(self):
+        """End the current cycle without measuring it, so time spent stopped isn't counted."""
+        with self._lock:
+            self._cycle_start = None
+
+    def use_in_gap(self):
+        """Whether the totem would run out before another cycle could finish."""
+        with self._lock:
+            estimate = self.cycle_estimate or 0.0
+        return self.remaining() <= estimate
+
+    def used(self):
+        with self._lock:
+            self.last_used = time.monotonic()
+
+    def reset(self):
+        """Forget the last use, e.g. after the totem interval was changed."""
+        with self._lock:
+            self.last_used = None